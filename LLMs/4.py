@@ -1,6 +1,12 @@
+import os
+import sys
 from manim import *
 import numpy as np
 
+# Modules shared by every course (e.g. glyph_label.py) are in the repo root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from glyph_label import NumberLabel
+
 class LearningProgress(Scene):
     def construct(self):
         # Add a background effect (gradient rectangle)
@@ -63,18 +69,21 @@ class LearningProgress(Scene):
         training_dot = Dot(color=GREEN)
         validation_dot = Dot(color=RED)
 
-        # Create value trackers
-        training_value = DecimalNumber(
+        # Create value trackers (drawn from pre-rendered digit glyphs, so
+        # updating them every frame doesn't render or parse any text)
+        training_value = NumberLabel(
             0,
-            num_decimal_places=3,
+            number_format='{:.3f}',
             color=GREEN,
-            font_size=24
+            font_size=24,
+            aligned_edge=LEFT
         )
-        validation_value = DecimalNumber(
+        validation_value = NumberLabel(
             0,
-            num_decimal_places=3,
+            number_format='{:.3f}',
             color=RED,
-            font_size=24
+            font_size=24,
+            aligned_edge=LEFT
         )
 
         # Create value tracker group and position it
@@ -1,6 +1,13 @@
+import os
+import sys
 from manim import *
 import numpy as np
 
+# Modules shared by every course (e.g. text_cache.py) are in the repo root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from text_cache import cached_text
+
 # Helper functions for activation
 def relu(x):
     return np.maximum(0, x)
@@ -14,7 +21,7 @@ def softmax(x):
 def draw_circle_with_text(text_str, radius=0.3, fill_color=GRAY, fill_opacity=0.6):
     circle = Circle(radius=radius, color=WHITE, stroke_width=2,
                     fill_color=fill_color, fill_opacity=fill_opacity)
-    text = Text(text_str, font_size=24)
+    text = cached_text(text_str, font_size=24)
     group = VGroup(circle, text)
     text.move_to(circle.get_center())
     return group
@@ -109,7 +116,7 @@ def softmax(x):
 def draw_circle_with_text(text_str, radius=0.3, fill_color=GRAY, fill_opacity=0.6):
     circle = Circle(radius=radius, color=WHITE, stroke_width=2,
                     fill_color=fill_color, fill_opacity=fill_opacity)
-    text = Text(text_str, font_size=24)
+    text = cached_text(text_str, font_size=24)
     group = VGroup(circle, text)
     text.move_to(circle.get_center())
     return group
@@ -211,7 +218,7 @@ def softmax(x):
 
 def draw_circle_with_text(text_str, radius=0.3, fill_color=GRAY, fill_opacity=0.6):
     circle = Circle(radius=radius, color=WHITE, stroke_width=2, fill_color=fill_color, fill_opacity=fill_opacity)
-    text = Text(text_str, font_size=24)
+    text = cached_text(text_str, font_size=24)
     group = VGroup(circle, text)
     text.move_to(circle.get_center())
     return group
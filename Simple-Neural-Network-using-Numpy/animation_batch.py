@@ -0,0 +1,52 @@
+# Relevant imports
+from manim import *
+
+
+# Collects animations and plays them together in a single self.play() call
+# (one partial movie file) rather than one call each.
+#   with AnimationBatch(self, run_time=1) as batch:
+#       batch.add(Transform(a, b))
+#       batch.add(FadeIn(c))
+# Animations are flushed when the `with` block ends (or flush() is called).
+# With a lag_ratio above 0 each animation starts that fraction of the way
+# through the previous one, otherwise they all run at once. A run_time of None
+# keeps each animation's own run time, so the batch lasts as long as they do.
+class AnimationBatch:
+
+    def __init__(self, scene, run_time=1.0, lag_ratio=0.0):
+        self.scene = scene
+        self.run_time = run_time
+        self.lag_ratio = lag_ratio
+        self.animations = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Don't play half a batch if something went wrong building it
+        if exc_type is None:
+            self.flush()
+
+    def __len__(self):
+        return len(self.animations)
+
+    def add(self, *animations):
+        self.animations += animations
+        return self
+
+    # Play the queued animations as one AnimationGroup
+    def flush(self):
+        if self.animations:
+            group = AnimationGroup(*self.animations, lag_ratio=self.lag_ratio)
+            if self.run_time is not None:
+                group.set_run_time(self.run_time)
+            self.scene.play(group)
+            self.animations = []
+
+
+# Play an animation straight away, or add it to a batch to play later
+def play_or_add(scene, animation, run_time, batch=None):
+    if batch is None:
+        scene.play(animation, run_time=run_time)
+    else:
+        batch.add(animation.set_run_time(run_time))
@@ -0,0 +1,76 @@
+# Benchmarks training on dense images against sparse (CSR) images, where the
+# first layer only touches the weights of non-zero pixels.
+# Both runs start from the same weights & biases. The weights after the first
+# CHECK_IMAGES images are compared to check both paths compute the same thing
+# (per-sample training is chaotic, so over a whole epoch rounding differences
+# grow until the weights are no longer comparable).
+# Training goes through an optimizer the way scene_heatmap.py trains, once for
+# each of OPTIMIZERS.
+#
+# Usage (from the folder holding train.csv & test.csv):
+#   python benchmark_sparse.py [images] [batch_size ...]
+
+# Relevant imports
+import sys
+import time
+from itertools import product
+import numpy as np
+
+from dataset import load_mnist, to_sparse
+from network import init_layer_params, train_epoch
+from optimizers import create_optimizer
+
+CHECK_IMAGES = 50
+OPTIMIZERS = ["sgd", "adam"]
+
+
+# Train for one epoch, returning the time taken & the trained weights/biases
+def time_epoch(train, Y, params, batch_size, optimizer_name):
+    w1, b1, w2, b2, w3, b3 = [param.copy() for param in params]
+    optimizer = create_optimizer(optimizer_name, [w1, b1, w2, b2, w3, b3])
+    start = time.perf_counter()
+    train_epoch(train, Y, w1, b1, w2, b2, w3, b3, optimizer.learning_rate
+                , batch_size=batch_size, optimizer=optimizer)
+    return time.perf_counter() - start, [w1, b1, w2, b2, w3, b3]
+
+
+if __name__ == '__main__':
+    images = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    batch_sizes = [int(size) for size in sys.argv[2:]] or [1, 32]
+
+    # Load the data
+    train, label, _ = load_mnist('train.csv', 'test.csv')
+    dense = train[:images]
+    label = label[:images]
+    Y = np.zeros((label.shape[0], 10), dtype=dense.dtype)
+    Y[np.arange(0, label.shape[0]), label] = 1.0
+
+    start = time.perf_counter()
+    sparse = to_sparse(dense)
+    conversion_time = time.perf_counter() - start
+    print(f'{images} images, {sparse.data.shape[0] / dense.size:.1%} non-zero pixels'
+          f', converted to CSR in {conversion_time:.2f}s')
+
+    # Randomly initialize weights & biases (shared by both runs)
+    w1, b1 = init_layer_params(10, 784, dense.dtype)  # Hidden Layer 1
+    w2, b2 = init_layer_params(10, 10, dense.dtype)  # Hidden Layer 2
+    w3, b3 = init_layer_params(10, 10, dense.dtype)  # Output Layer
+    params = [w1, b1, w2, b2, w3, b3]
+
+    for optimizer_name, batch_size in product(OPTIMIZERS, batch_sizes):
+        dense_time, _ = time_epoch(dense, Y, params, batch_size, optimizer_name)
+        sparse_time, _ = time_epoch(sparse, Y, params, batch_size, optimizer_name)
+
+        # Check both paths match
+        _, dense_params = time_epoch(dense[:CHECK_IMAGES], Y[:CHECK_IMAGES]
+                                     , params, batch_size, optimizer_name)
+        _, sparse_params = time_epoch(sparse[:CHECK_IMAGES], Y[:CHECK_IMAGES]
+                                      , params, batch_size, optimizer_name)
+        difference = max(np.max(np.abs(dense_param - sparse_param))
+                         for dense_param, sparse_param in zip(dense_params
+                                                              , sparse_params))
+        print(f'{optimizer_name:>8}, batch size {batch_size:>4}: '
+              f'dense {dense_time / images * 1e6:7.1f}us/image, '
+              f'sparse {sparse_time / images * 1e6:7.1f}us/image, '
+              f'speed up {dense_time / sparse_time:.2f}x, '
+              f'max weight difference {difference:.2e}')
@@ -0,0 +1,81 @@
+# Relevant imports
+import os
+import numpy as np
+
+PARAM_NAMES = ["w1", "b1", "w2", "b2", "w3", "b3"]
+CHECKPOINT_KEYS = PARAM_NAMES + ["epoch", "accuracies", "settings", "rng_keys"
+                                 , "rng_pos", "rng_has_gauss", "rng_cached_gaussian"]
+
+
+# Save arrays to a .npz file, writing to a temporary file first so a crash
+# (or Ctrl-C) part way through never leaves a half-written file behind
+def save_npz(path, **arrays):
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as file:
+        np.savez_compressed(file, **arrays)
+    os.replace(temp_path, path)
+
+
+# Save the training state after an epoch:
+#   - Weights & biases (w1, b1, w2, b2, w3, b3)
+#   - Number of completed epochs
+#   - Accuracy (%) after each completed epoch
+#   - The settings the run was trained with (a dictionary, e.g. the optimizer
+#     & batch size; see can_resume)
+#   - NumPy's random number generator state
+#   - Any other arrays a scene needs to resume (passed as keyword arguments)
+def save_checkpoint(path, params, epoch, accuracies, settings, **arrays):
+    _, rng_keys, rng_pos, rng_has_gauss, rng_cached_gaussian = np.random.get_state()
+    save_npz(path
+             , **arrays
+             , **dict(zip(PARAM_NAMES, params))
+             , epoch=epoch
+             , accuracies=np.array(accuracies, dtype=np.float64)
+             , settings=np.array(settings_string(settings))
+             , rng_keys=rng_keys
+             , rng_pos=rng_pos
+             , rng_has_gauss=rng_has_gauss
+             , rng_cached_gaussian=rng_cached_gaussian)
+
+
+# Settings as one string (stored in the checkpoint & compared by can_resume)
+def settings_string(settings):
+    return repr(sorted(settings.items()))
+
+
+# Whether a run with the given settings can carry on from the checkpoint at
+# `path`: it must exist, have been saved with the same settings & every file
+# in required_files (e.g. the scene's training trace) must exist too.
+# Prints a notice when a checkpoint is ignored.
+def can_resume(path, settings, required_files=()):
+    if not os.path.exists(path):
+        return False
+    with np.load(path) as data:
+        saved_settings = str(data["settings"]) if "settings" in data.files else None
+    if saved_settings != settings_string(settings):
+        print(f'Not resuming from {path}: it was saved with different settings '
+              f'(now {settings}), starting training again')
+        return False
+    for file in required_files:
+        if not os.path.exists(file):
+            print(f'Not resuming from {path}: {file} is missing, '
+                  f'starting training again')
+            return False
+    return True
+
+
+# Load a checkpoint saved by save_checkpoint.
+# Returns the weights & biases, number of completed epochs, accuracy history,
+# random number generator state (for np.random.set_state) and a dictionary of
+# any other arrays that were saved
+def load_checkpoint(path):
+    with np.load(path) as data:
+        params = [data[name] for name in PARAM_NAMES]
+        epoch = int(data["epoch"])
+        accuracies = [float(accuracy) for accuracy in data["accuracies"]]
+        rng_state = ("MT19937", data["rng_keys"], int(data["rng_pos"])
+                     , int(data["rng_has_gauss"])
+                     , float(data["rng_cached_gaussian"]))
+        arrays = {key: data[key] for key in data.files
+                  if key not in CHECKPOINT_KEYS}
+    return params, epoch, accuracies, rng_state, arrays
@@ -0,0 +1,56 @@
+# Relevant imports
+from manim import *
+import numpy as np
+
+# Number of lookup table entries for each sign (so opacity steps of 1/256,
+# finer than the 8 bit colour channels it's drawn with)
+COLORMAP_LEVELS = 256
+
+# Diverging palettes: name -> (colour for negative values, colour for positive
+# values). A value in [-1, 1] is drawn in the colour for its sign with
+# opacity = |value|. Palettes with the same colour for both signs are
+# sequential (e.g. for layer outputs, which are never negative).
+PALETTES = {
+    "green_red": (RED, GREEN),
+    "blue_red": (RED, BLUE),
+    "blue_orange": (ORANGE, BLUE),
+    "gray": (GRAY, GRAY),
+    "white": (WHITE, WHITE),
+}
+
+# Lookup tables per palette & number of levels (see colormap_table)
+_colormap_tables = {}
+
+
+# RGBA lookup table for a palette, one row per value from -1 to 1 in steps of
+# 1 / levels (row `levels` is 0, which is transparent)
+def colormap_table(palette, levels=COLORMAP_LEVELS):
+    if (palette, levels) not in _colormap_tables:
+        if palette not in PALETTES:
+            raise ValueError(f'Unknown palette "{palette}", '
+                             f'expected one of {list(PALETTES)}')
+        negative, positive = PALETTES[palette]
+        steps = np.arange(-levels, levels + 1) / levels
+        table = np.empty((2 * levels + 1, 4))
+        table[:, :3] = np.where((steps >= 0)[:, None]
+                                , color_to_rgb(positive), color_to_rgb(negative))
+        table[:, 3] = np.absolute(steps)
+        _colormap_tables[(palette, levels)] = table
+    return _colormap_tables[(palette, levels)]
+
+
+# Divide an array by its largest absolute value (along an axis, if given), so
+# its values are in [-1, 1]. All-zero arrays (or rows) stay 0.
+def normalise(array, axis=None):
+    array = np.asarray(array, dtype=np.float64)
+    largest = np.max(np.absolute(array), axis=axis, keepdims=True)
+    return np.divide(array, largest, out=np.zeros_like(array), where=largest > 0)
+
+
+# RGBA colour of each value in an array of values in [-1, 1] (values outside
+# are clipped), looked up in a palette's table in one step. The result has
+# the array's shape plus a last axis of 4.
+def colormap_colors(values, palette="green_red", levels=COLORMAP_LEVELS):
+    table = colormap_table(palette, levels)
+    values = np.clip(np.asarray(values, dtype=np.float64), -1, 1)
+    return table[np.rint((values + 1) * levels).astype(np.intp)]
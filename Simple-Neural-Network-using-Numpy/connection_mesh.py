@@ -0,0 +1,97 @@
+# Relevant imports
+from manim import *
+import numpy as np
+
+from colormap import colormap_colors, normalise
+from value_animation import ValueAnimation
+
+# Palette connections are drawn with (see colormap.PALETTES)
+CONNECTION_PALETTE = "green_red"
+
+# Number of distinct opacities each colour is drawn with
+OPACITY_LEVELS = 32
+
+
+# Signed strength (in [-1, 1]) of each connection for a weight matrix, one
+# entry per weight in row-major order: each weight divided by the largest
+# absolute weight into the same right layer node
+def connection_strengths(w):
+    return normalise(w, axis=1).flatten()
+
+
+# Lines connecting every node in one layer to every node in the next, coloured
+# by the weight between them (by default green for positive, red for negative,
+# opacity = strength).
+# The lines' end points are computed once. Rather than one Line mobject per
+# weight, lines are drawn by 2 * OPACITY_LEVELS mobjects (one per colour &
+# opacity), each holding all its lines as separate paths, so wider layers add
+# paths but not mobjects. set_weights (or the UpdateConnections animation)
+# changes the lines' strengths & regroups them in one vectorised step.
+class ConnectionMesh(VGroup):
+
+    def __init__(self, left_points, right_points, w
+                 , stroke_width=DEFAULT_STROKE_WIDTH, levels=OPACITY_LEVELS
+                 , palette=CONNECTION_PALETTE):
+        self.levels = levels
+
+        # Start & end of the line for each weight w[l, r] (row-major), from
+        # right layer node l to left layer node r
+        left_points = np.asarray(left_points, dtype=np.float64)
+        right_points = np.asarray(right_points, dtype=np.float64)
+        starts = np.repeat(right_points, left_points.shape[0], axis=0)
+        ends = np.tile(left_points, (right_points.shape[0], 1))
+
+        # Each straight line as one cubic Bezier curve (4 control points)
+        thirds = np.array([0, 1 / 3, 2 / 3, 1])[None, :, None]
+        self.line_points = starts[:, None, :] + thirds * (ends - starts)[:, None, :]
+
+        # One mobject per colour & opacity level: positive strengths
+        # 1 / levels to 1, then negative strengths -1 / levels to -1
+        level_strengths = np.arange(1, levels + 1) / levels
+        self.layers = [
+            VMobject(stroke_color=rgb_to_color(color[:3])
+                     , stroke_opacity=color[3]
+                     , stroke_width=stroke_width)
+            for color in colormap_colors(np.concatenate([level_strengths, -level_strengths])
+                                         , palette)
+        ]
+        super().__init__(*self.layers)
+
+        self.strengths = connection_strengths(w)
+        self.apply_strengths()
+
+    # Give each layer mobject the lines whose colour & opacity it draws
+    def apply_strengths(self):
+        # Index of the layer drawing each line (-1 for invisible lines)
+        opacity_levels = np.rint(np.absolute(self.strengths) * self.levels).astype(np.intp)
+        layer_index = opacity_levels - 1 + (self.strengths < 0) * self.levels
+        layer_index[opacity_levels == 0] = -1
+
+        # Sort the lines by layer & hand out each layer's run of lines
+        order = np.argsort(layer_index, kind='stable')
+        counts = np.bincount(layer_index + 1, minlength=len(self.layers) + 1)
+        bounds = np.cumsum(counts)
+        for i, layer in enumerate(self.layers):
+            lines = order[bounds[i]:bounds[i + 1]]
+            layer.points = self.line_points[lines].reshape(-1, 3)
+        return self
+
+    # Recolour the lines to show a new weight matrix
+    def set_weights(self, w):
+        self.strengths[:] = connection_strengths(w)
+        return self.apply_strengths()
+
+
+# Fades a connection mesh to a new weight matrix, interpolating the lines'
+# strengths (the lines' end points are left untouched)
+class UpdateConnections(ValueAnimation):
+
+    def __init__(self, mesh, w, **kwargs):
+        super().__init__(mesh, connection_strengths(w), **kwargs)
+
+    def get_values(self):
+        return self.mobject.strengths.copy()
+
+    def set_values(self, strengths):
+        self.mobject.strengths[:] = strengths
+        self.mobject.apply_strengths()
@@ -0,0 +1,143 @@
+# Relevant imports
+import os
+import numpy as np
+import pandas as pd
+
+
+# Wraps an array of raw 0-255 pixel values. Slicing it returns the selected
+# rows normalised to [0, 1], so only the rows actually used are converted.
+class NormalisedImages:
+
+    def __init__(self, pixels, dtype=np.float32):
+        self.pixels = pixels
+        self.dtype = dtype
+
+    @property
+    def shape(self):
+        return self.pixels.shape
+
+    def __len__(self):
+        return self.pixels.shape[0]
+
+    def __getitem__(self, index):
+        images = np.asarray(self.pixels[index], dtype=self.dtype)
+        images /= 255
+        return images
+
+
+# Load a csv of 0-255 integer values, converting it to a uint8 .npy cache
+# next to the csv the first time. Later calls memory-map the cache instead of
+# parsing the csv again.
+def load_cached_csv(csv_path):
+    cache_path = os.path.splitext(csv_path)[0] + '.npy'
+
+    # (Re)build the cache if it's missing or older than the csv
+    if (not os.path.exists(cache_path)
+            or os.path.getmtime(cache_path) < os.path.getmtime(csv_path)):
+        data = np.array(pd.read_csv(csv_path, delimiter=','), dtype=np.uint8)
+
+        # Write to a temporary file first so that scenes rendering in
+        # parallel never see a half-written cache
+        temp_path = f'{cache_path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as file:
+            np.save(file, data)
+        os.replace(temp_path, cache_path)
+
+    return np.load(cache_path, mmap_mode='r')
+
+
+# Load the MNIST train & test datasets.
+# Returns:
+#   - Training images (normalised lazily, one row per image)
+#   - Training labels
+#   - Test images (normalised lazily, one row per image)
+def load_mnist(train_path='train.csv', test_path='test.csv', dtype=np.float32):
+    train = load_cached_csv(train_path)
+    test = load_cached_csv(test_path)
+
+    # The first column of the training dataset holds the labels
+    label = np.array(train[:, 0], dtype=np.int64)
+    # The train dataset becomes all columns except the first
+    train = train[:, 1:]
+
+    return NormalisedImages(train, dtype), label, NormalisedImages(test, dtype)
+
+
+# Select the images used to validate the network after each epoch: the first
+# `fraction` of the test images. Kaggle's test.csv has no labels, in which case
+# `fraction` of the training images is held out from the end of the training
+# data instead (and the network is trained on the rest).
+# Returns:
+#   - Training images & labels (without any held out images)
+#   - Validation images & labels
+def split_validation(train, label, test_path='test.csv', fraction=0.1):
+    test = load_cached_csv(test_path)
+
+    # A labelled test set has the label in its first column, like train.csv
+    if test.shape[1] == train.shape[1] + 1:
+        count = int(round(test.shape[0] * fraction))
+        return (train, label
+                , NormalisedImages(test[:count, 1:], train.dtype)
+                , np.array(test[:count, 0], dtype=np.int64))
+
+    split = train.shape[0] - int(round(train.shape[0] * fraction))
+    return (NormalisedImages(train.pixels[:split], train.dtype), label[:split]
+            , NormalisedImages(train.pixels[split:], train.dtype), label[split:])
+
+
+# Compressed sparse row (CSR) copy of a set of normalised images, storing only
+# the non-zero pixels. Image i's non-zero pixels are at the column positions
+# indices[indptr[i]:indptr[i + 1]] with values data[indptr[i]:indptr[i + 1]].
+class SparseImages:
+
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = shape
+
+    def __len__(self):
+        return self.shape[0]
+
+    # Select a contiguous range of images (e.g. a training batch)
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            raise TypeError("SparseImages can only be sliced by a range of rows")
+        start, stop, step = index.indices(self.shape[0])
+        if step != 1:
+            raise TypeError("SparseImages can only be sliced by a range of rows")
+        stop = max(start, stop)
+
+        begin = self.indptr[start]
+        end = self.indptr[stop]
+        return SparseImages(self.indptr[start:stop + 1] - begin
+                            , self.indices[begin:end]
+                            , self.data[begin:end]
+                            , (stop - start, self.shape[1]))
+
+    def toarray(self):
+        dense = np.zeros(self.shape, dtype=self.data.dtype)
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        dense[rows, self.indices] = self.data
+        return dense
+
+
+# Convert (normalised) images into a SparseImages copy, one chunk at a time so
+# the dense images are never all held in memory at once
+def to_sparse(images, chunk_size=4096):
+    total = images.shape[0]
+    counts = []
+    indices = []
+    data = []
+
+    for start in range(0, total, chunk_size):
+        chunk = images[start:start + chunk_size]
+        rows, columns = np.nonzero(chunk)
+        counts += [np.bincount(rows, minlength=chunk.shape[0])]
+        indices += [columns.astype(np.int32)]
+        data += [chunk[rows, columns]]
+
+    indptr = np.zeros(total + 1, dtype=np.int64)
+    np.cumsum(np.concatenate(counts), out=indptr[1:])
+    return SparseImages(indptr, np.concatenate(indices), np.concatenate(data)
+                        , images.shape)
@@ -0,0 +1,113 @@
+# Relevant imports
+from manim import *
+import numpy as np
+
+from colormap import colormap_colors, normalise
+from text_cache import cached_text
+from value_animation import ValueAnimation
+
+# Palette heatmaps are drawn with (see colormap.PALETTES)
+HEATMAP_PALETTE = "green_red"
+
+
+# Fill colour (RGBA) of each cell for an array of values, one row per cell in
+# row-major order: by default green for positive values, red for negative
+# values, with opacity |value| / max(|value|)
+def heatmap_colors(array, palette=HEATMAP_PALETTE):
+    return colormap_colors(normalise(array).flatten(), palette)
+
+
+# heatmap_colors for a 2D array, shaped (rows, cols, 4) so it can be used as a
+# pixel_image.PixelImage colormap (e.g. to draw a row of weights as an image)
+def heatmap_image_colors(array, palette=HEATMAP_PALETTE):
+    return colormap_colors(normalise(array), palette)
+
+
+# A grid of squares (one per array value) with a label.
+# The squares & label are created once; set_values (or the UpdateHeatmap
+# animation) only changes the squares' fill colours & opacities, which are
+# held in one (rows * cols, 4) RGBA array.
+class Heatmap(VGroup):
+
+    def __init__(self, array, scale, label, font_size, label_direction=UP
+                 , palette=HEATMAP_PALETTE):
+        rows, cols = array.shape
+
+        # Create squares to represent values & arrange them into a grid
+        self.cells = VGroup(*[
+            Square(stroke_width=0.3).scale(scale) for _ in range(rows * cols)
+        ]).arrange_in_grid(rows=rows, buff=0)
+
+        # Create label
+        self.label = cached_text(label, font_size=font_size)
+        self.label.next_to(self.cells, label_direction)
+
+        super().__init__(self.cells, self.label)
+
+        self.palette = palette
+        self.colors = heatmap_colors(array, palette)
+        self.apply_colors()
+
+    # Copy the colour array into the squares' fill colours (only for the cells
+    # at the given indices, if given).
+    # The copy is per square because Cairo fills each square from its own
+    # fill_rgbas: a single VMobject has one fill for all of its paths (extra
+    # rows become a gradient), and squares whose fill_rgbas were views of the
+    # colour array would be unlinked whenever Manim reassigns them (e.g. in
+    # Transform / FadeIn). Drawing the cells as an image instead would stop
+    # the heatmaps working with Create. Copying 100 RGBA rows takes ~0.02ms.
+    def apply_colors(self, indices=None):
+        if indices is None:
+            indices = range(len(self.colors))
+        for i in indices:
+            self.cells[i].fill_rgbas[:] = self.colors[i]
+        return self
+
+    # Recolour the squares to show a new array of values
+    def set_values(self, array):
+        self.colors[:] = heatmap_colors(array, self.palette)
+        return self.apply_colors()
+
+
+# Fades a heatmap's colours to those of a new array of values, interpolating
+# the colour array (the squares' geometry & the label are left untouched).
+# With a threshold, only cells whose colour or opacity changes by more than the
+# threshold are animated; the others are set to their (barely different) new
+# colour straight away & then left alone.
+# The animation's mobject is a group of just the animated cells, so Manim only
+# redraws those on every frame: the rest of the heatmap is drawn once, into the
+# static image behind the animation. (Manim adds this group to the scene,
+# taking the cells out of the heatmap there, so the whole heatmap is added back
+# once the animation ends.)
+class UpdateHeatmap(ValueAnimation):
+
+    def __init__(self, heatmap, array, threshold=None, **kwargs):
+        self.heatmap = heatmap
+        target_colors = heatmap_colors(array, heatmap.palette)
+        if threshold is None:
+            self.changed = np.arange(len(target_colors))
+        else:
+            change = np.max(np.absolute(target_colors - heatmap.colors), axis=1)
+            self.changed = np.flatnonzero(change > threshold)
+        self.snapped = np.setdiff1d(np.arange(len(target_colors)), self.changed)
+        self.snapped_colors = target_colors[self.snapped]
+        super().__init__(VGroup(*[heatmap.cells[i] for i in self.changed])
+                         , target_colors[self.changed], **kwargs)
+
+    def begin(self):
+        # Snap the cells that barely change (before Manim draws the static
+        # image)
+        self.heatmap.colors[self.snapped] = self.snapped_colors
+        self.heatmap.apply_colors(self.snapped)
+        super().begin()
+
+    def get_values(self):
+        return self.heatmap.colors[self.changed]
+
+    def set_values(self, colors):
+        self.heatmap.colors[self.changed] = colors
+        self.heatmap.apply_colors(self.changed)
+
+    def clean_up_from_scene(self, scene):
+        super().clean_up_from_scene(scene)
+        scene.add(self.heatmap)
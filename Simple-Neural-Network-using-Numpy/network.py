@@ -0,0 +1,362 @@
+# Relevant imports
+import numpy as np
+
+# Activation functions
+def relu(X):
+    return np.maximum(0,X)
+
+# stable softmax
+def softmax(X):
+    Z = X - max(X)
+    numerator = np.exp(Z)
+    denominator = np.sum(numerator)
+    return numerator/denominator
+
+# Calculates the output of a given layer
+def calculate_layer_output(w, prev_layer_output, b, activation_type="relu"):
+    # Steps 1 & 2
+    g = w @ prev_layer_output + b
+
+    # Step 3
+    if activation_type == "relu":
+        return relu(g)
+    if activation_type == "softmax":
+        return softmax(g)
+
+# Initialize weights & biases
+# (dtype=np.float32 halves the memory used & keeps training in single precision)
+def init_layer_params(row, col, dtype=np.float64):
+    w = np.random.randn(row, col).astype(dtype)
+    b = np.random.randn(row, 1).astype(dtype)
+    return w, b
+
+# Calculate ReLU derivative
+def relu_derivative(g):
+    derivative = g.copy()
+    derivative[derivative <= 0] = 0
+    derivative[derivative > 0] = 1
+    return np.diag(derivative.T[0])
+
+# Calculate Softmax derivative
+def softmax_derivative(o):
+    # d o_i / d g_j = o_i * (1 - o_i) when i == j, otherwise -o_i * o_j
+    return np.diagflat(o) - o @ o.T
+
+# Apply the ReLU derivative to an incoming derivative directly. The ReLU
+# Jacobian is diagonal, so this is just a mask multiply.
+def relu_backward(previous_derivative, layer_output):
+    return previous_derivative * (layer_output > 0)
+
+# Apply the Softmax derivative to an incoming derivative directly (a
+# vector-Jacobian product): dL_dg = o * (dL_do - sum(dL_do * o)).
+# With the MSE loss derivative dL_do = 2 * (o - y) this gives the combined
+# Softmax + MSE gradient in two elementwise steps.
+# axis is the axis the layer's units lie along (0 for column vectors).
+def softmax_backward(previous_derivative, layer_output, axis=0):
+    return layer_output * (previous_derivative
+                           - np.sum(previous_derivative * layer_output
+                                    , axis=axis, keepdims=True))
+
+# The fast path (default) applies the activation derivatives elementwise.
+# Setting fast=False builds the full Jacobian matrices instead, which matches
+# the step-by-step maths but costs O(n^2) per sample.
+def layer_backprop(previous_derivative, layer_output, previous_layer_output
+                   , w, activation_type="relu", fast=True):
+    # 1. Calculate the derivative of the activation func & apply chain rule to
+    #    get derivative of Loss function with respect to the activation func
+    dL_dg = None
+    if fast:
+        if activation_type == "relu":
+            dL_dg = relu_backward(previous_derivative, layer_output)
+        elif activation_type == "softmax":
+            dL_dg = softmax_backward(previous_derivative, layer_output)
+    else:
+        dh_dg = None
+        if activation_type == "relu":
+            dh_dg = relu_derivative(layer_output)
+        elif activation_type == "softmax":
+            dh_dg = softmax_derivative(layer_output)
+        dL_dg = dh_dg @ previous_derivative
+
+    # 2. Calculate the derivative of the linear function with respect to:
+    dg_dw = previous_layer_output.T     # a) weight matrix
+    dg_dh = w.T                         # b) previous layer output
+    dg_db = 1.0                         # c) bias vector
+
+    # 3. Apply chain rule to get derivative of Loss function with respect to:
+    dL_dw = dL_dg @ dg_dw               # a) weight matrix
+    dL_dh = dg_dh @ dL_dg               # b) previous layer output
+    dL_db = dL_dg * dg_db               # c) bias vector
+
+    return dL_dw, dL_dh, dL_db
+
+def gradient_descent(w, b, dL_dw, dL_db, learning_rate):
+    w -= learning_rate * dL_dw
+    b -= learning_rate * dL_db
+    return w, b
+
+def get_prediction(o):
+    return np.argmax(o)
+
+### BATCHED TRAINING ###
+# The functions below work on (batch, n) matrices: one image per row rather
+# than one image per column vector. Weights & biases keep the same shapes as
+# above, so they can be used interchangeably with the per-sample functions.
+# Activations & gradients keep the dtype of the data, weights & biases, so
+# passing float32 arrays keeps the whole training step in float32.
+
+# Row-wise stable softmax
+def batch_softmax(X):
+    Z = X - np.max(X, axis=1, keepdims=True)
+    numerator = np.exp(Z)
+    denominator = np.sum(numerator, axis=1, keepdims=True)
+    return numerator/denominator
+
+# Calculates the output of a given layer for a batch of inputs
+def calculate_batch_output(w, prev_layer_output, b, activation_type="relu"):
+    # Steps 1 & 2
+    g = prev_layer_output @ w.T + b.T
+
+    # Step 3
+    if activation_type == "relu":
+        return relu(g)
+    if activation_type == "softmax":
+        return batch_softmax(g)
+
+def batch_backprop(previous_derivative, layer_output, previous_layer_output
+                   , w, activation_type="relu"):
+    batch_size = previous_derivative.shape[0]
+
+    # 1. Apply chain rule through the activation func, one row per sample
+    dL_dg = None
+    if activation_type == "relu":
+        dL_dg = relu_backward(previous_derivative, layer_output)
+    elif activation_type == "softmax":
+        dL_dg = softmax_backward(previous_derivative, layer_output, axis=1)
+
+    # 2. Apply chain rule through the linear function. Weight & bias
+    #    derivatives are averaged over the batch, the derivative passed on to
+    #    the previous layer stays per sample.
+    dL_dw = dL_dg.T @ previous_layer_output / batch_size    # a) weight matrix
+    dL_dh = dL_dg @ w                                       # b) previous layer output
+    dL_db = np.sum(dL_dg, axis=0, keepdims=True).T / batch_size  # c) bias vector
+
+    return dL_dw, dL_dh, dL_db
+
+### SPARSE INPUT ###
+# Most MNIST pixels are 0, so the first layer can work on sparse (CSR) images
+# (see dataset.SparseImages) and only touch the weights of non-zero pixels.
+
+# Calculates the output of a given layer for a batch of sparse inputs
+def calculate_sparse_batch_output(w, prev_layer_output, b, activation_type="relu"):
+    X = prev_layer_output
+
+    # Steps 1 & 2 (only the weight columns of non-zero pixels are used)
+    if X.shape[0] == 1:
+        g = (X.data @ w.T[X.indices])[np.newaxis]
+    else:
+        # Sum each image's weighted pixels using a running total over all
+        # non-zero pixels in the batch
+        weighted_pixels = X.data[:, np.newaxis] * w.T[X.indices]
+        running_total = np.zeros((weighted_pixels.shape[0] + 1, w.shape[0])
+                                 , dtype=weighted_pixels.dtype)
+        np.cumsum(weighted_pixels, axis=0, out=running_total[1:])
+        g = running_total[X.indptr[1:]] - running_total[X.indptr[:-1]]
+    g += b.T
+
+    # Step 3
+    if activation_type == "relu":
+        return relu(g)
+    if activation_type == "softmax":
+        return batch_softmax(g)
+
+# Derivative of the Loss function with respect to a layer's weights for a
+# batch of sparse inputs, given the derivative with respect to the activation
+# func (dL_dg). Averaged over the batch like batch_backprop.
+def sparse_weight_gradient(prev_layer_output, dL_dg, shape):
+    X = prev_layer_output
+    batch_size = X.shape[0]
+    rows = np.repeat(np.arange(batch_size), np.diff(X.indptr))
+
+    if batch_size == 1:
+        # Each pixel appears once, so only its weight column is non-zero
+        dL_dw = np.zeros(shape, dtype=dL_dg.dtype)
+        dL_dw.T[X.indices] = np.outer(X.data, dL_dg[0])
+        return dL_dw
+
+    dL_dw = np.empty(shape, dtype=dL_dg.dtype)
+    for unit in range(shape[0]):
+        dL_dw[unit] = np.bincount(X.indices, weights=X.data * dL_dg[rows, unit]
+                                  , minlength=shape[1])
+    dL_dw /= batch_size
+    return dL_dw
+
+# Gradient descent step for a layer with a batch of sparse inputs, given the
+# derivative of the Loss function with respect to the activation func (dL_dg).
+# Only the weight columns of non-zero pixels are updated.
+def sparse_gradient_descent(w, b, prev_layer_output, dL_dg, learning_rate):
+    X = prev_layer_output
+    batch_size = X.shape[0]
+
+    if batch_size == 1:
+        # Each pixel appears once, so its weight column can be updated directly
+        w.T[X.indices] -= learning_rate * np.outer(X.data, dL_dg[0])
+    else:
+        # Pixels can appear in several images, so sum each pixel's updates
+        # across the batch
+        w -= learning_rate * sparse_weight_gradient(X, dL_dg, w.shape)
+    b -= learning_rate * np.sum(dL_dg, axis=0, keepdims=True).T / batch_size
+    return w, b
+
+# Train the network for a single epoch using mini-batches.
+# A batch size of 1 reproduces the original per-sample training loop.
+# train can also be a dataset.SparseImages, in which case the first layer only
+# touches the weights of non-zero pixels.
+# If an optimizer (see optimizers.py) is given it updates the weights & biases,
+# otherwise plain gradient descent with learning_rate is used. An SGD optimizer
+# with sparse input takes the same sparse update as plain gradient descent.
+def train_epoch(train, Y, w1, b1, w2, b2, w3, b3, learning_rate
+                , batch_size=1, optimizer=None):
+    # Set params
+    total = train.shape[0]
+    sparse = hasattr(train, "indptr")
+
+    # Plain gradient descent (e.g. an optimizers.SGD) is applied directly to
+    # sparse input, so only the weight columns of non-zero pixels are updated
+    if sparse and optimizer is not None and optimizer.sparse_updates:
+        learning_rate = optimizer.learning_rate
+        optimizer = None
+
+    # Iterate through training data one batch at a time
+    for start in range(0, total, batch_size):
+        # Select a batch of images and associated y vectors
+        X = train[start:start + batch_size]
+        y = Y[start:start + batch_size]
+
+        # 1. Forward pass: compute Output/Prediction (o)
+        if sparse:
+            h1 = calculate_sparse_batch_output(w1, X, b1, activation_type="relu")
+        else:
+            h1 = calculate_batch_output(w1, X, b1, activation_type="relu")
+        h2 = calculate_batch_output(w2, h1, b2, activation_type="relu")
+        o = calculate_batch_output(w3, h2, b3, activation_type="softmax")
+
+        # 2. Backpropagation
+        # Compute Loss derivative w.r.t. Output/Prediction (o)
+        dL_do = 2.0 * (o - y)
+
+        # Compute Output Layer derivatives
+        dL3_dw3, dL3_dh2, dL3_db3 = batch_backprop(dL_do, o, h2, w3
+                                                   , "softmax")
+        # Compute Hidden Layer 2 derivatives
+        dL2_dw2, dL2_dh2, dL2_db2 = batch_backprop(dL3_dh2, h2, h1, w2
+                                                   , "relu")
+        # Compute Hidden Layer 1 derivatives
+        if sparse:
+            dL1_dg1 = relu_backward(dL2_dh2, h1)
+        else:
+            dL1_dw1, _, dL1_db1 = batch_backprop(dL2_dh2, h1, X, w1
+                                                 , "relu")
+
+        # 3. Update weights & biases
+        if optimizer is not None:
+            if sparse:
+                dL1_dw1 = sparse_weight_gradient(X, dL1_dg1, w1.shape)
+                dL1_db1 = np.sum(dL1_dg1, axis=0, keepdims=True).T / X.shape[0]
+            optimizer.step([dL1_dw1, dL1_db1, dL2_dw2, dL2_db2, dL3_dw3, dL3_db3])
+        else:
+            if sparse:
+                sparse_gradient_descent(w1, b1, X, dL1_dg1, learning_rate)
+            else:
+                gradient_descent(w1, b1, dL1_dw1, dL1_db1, learning_rate)
+            gradient_descent(w2, b2, dL2_dw2, dL2_db2, learning_rate)
+            gradient_descent(w3, b3, dL3_dw3, dL3_db3, learning_rate)
+
+# Calculates the output of a given layer for a batch of inputs, writing the
+# result into a preallocated (batch, n) buffer instead of allocating a new one
+def calculate_batch_output_into(w, prev_layer_output, b, out
+                                , activation_type="relu"):
+    # Steps 1 & 2
+    np.matmul(prev_layer_output, w.T, out=out)
+    out += b.T
+
+    # Step 3
+    if activation_type == "relu":
+        np.maximum(out, 0, out=out)
+    elif activation_type == "softmax":
+        out -= np.max(out, axis=1, keepdims=True)
+        np.exp(out, out=out)
+        out /= np.sum(out, axis=1, keepdims=True)
+    return out
+
+# Evaluate the network across a whole dataset, one chunk of images at a time.
+# Returns:
+#   - Accuracy (%)
+#   - Confusion matrix (rows = label, columns = prediction)
+#   - Mean loss per image
+def evaluate(data, label, w1, b1, w2, b2, w3, b3, chunk_size=4096):
+    # Set params
+    total = data.shape[0]
+    num_classes = w3.shape[0]
+    confusion = np.zeros((num_classes, num_classes), dtype=np.int64)
+    loss = 0.0
+
+    # Preallocate activation buffers, reused for every chunk
+    h1_buffer = np.empty((chunk_size, w1.shape[0]), dtype=w1.dtype)
+    h2_buffer = np.empty((chunk_size, w2.shape[0]), dtype=w2.dtype)
+    o_buffer = np.empty((chunk_size, w3.shape[0]), dtype=w3.dtype)
+
+    # Iterate through the data one chunk at a time
+    for start in range(0, total, chunk_size):
+        # Select a chunk of images and associated labels
+        X = data[start:start + chunk_size]
+        chunk_label = label[start:start + chunk_size]
+        n = X.shape[0]
+
+        # Forward pass: compute Output/Prediction (o)
+        h1 = calculate_batch_output_into(w1, X, b1, h1_buffer[:n], "relu")
+        h2 = calculate_batch_output_into(w2, h1, b2, h2_buffer[:n], "relu")
+        o = calculate_batch_output_into(w3, h2, b3, o_buffer[:n], "softmax")
+
+        # Count (label, prediction) pairs
+        predictions = np.argmax(o, axis=1)
+        confusion += np.bincount(chunk_label * num_classes + predictions
+                                 , minlength=num_classes * num_classes
+                                 ).reshape(num_classes, num_classes)
+
+        # Sum of squared errors against the one-hot y vectors:
+        # sum((o - y)^2) = sum(o^2) - 2 * o[label] + 1
+        loss += (np.einsum('ij,ij->', o, o)
+                 - 2.0 * np.sum(o[np.arange(n), chunk_label])
+                 + n)
+
+    accuracy = np.trace(confusion) / total * 100
+    return accuracy, confusion, loss / total
+
+# Snapshot the network's activations for a few images (e.g. the training data
+# points a scene tracks) in one batched forward pass, typically once the
+# epoch's training has finished. Each activation has one column per image (in
+# the order given):
+#   - h1, h2, o: the layers' outputs
+#   - w2h1, w3h2: the weighted inputs of hidden layer 2 & the output layer
+#     (before the biases & activation funcs are applied)
+#   - predictions: the predicted digit for each image
+def snapshot_activations(images, w1, b1, w2, b2, w3, b3):
+    h1 = calculate_batch_output(w1, images, b1, activation_type="relu")
+    w2h1 = h1 @ w2.T
+    h2 = relu(w2h1 + b2.T)
+    w3h2 = h2 @ w3.T
+    o = batch_softmax(w3h2 + b3.T)
+    return {
+        "h1": h1.T,
+        "w2h1": w2h1.T,
+        "h2": h2.T,
+        "w3h2": w3h2.T,
+        "o": o.T,
+        "predictions": np.argmax(o, axis=1),
+    }
+
+# Compute Accuracy (%) across all training data
+def compute_accuracy(train, label, w1, b1, w2, b2, w3, b3):
+    accuracy, _, _ = evaluate(train, label, w1, b1, w2, b2, w3, b3)
+    return accuracy
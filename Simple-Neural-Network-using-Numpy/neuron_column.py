@@ -0,0 +1,87 @@
+# Relevant imports
+from manim import *
+import numpy as np
+
+from colormap import colormap_colors, normalise
+from glyph_label import NumberLabel
+from value_animation import ValueAnimation
+
+# Palette the nodes are filled with (see colormap.PALETTES)
+NEURON_PALETTE = "gray"
+
+
+# Fill opacity of each node for a layer's output: each value divided by the
+# largest absolute value (all 0 if the largest value is 0)
+def neuron_opacities(values):
+    values = np.asarray(values, dtype=np.float64).flatten()
+    if np.max(values) == 0.0:
+        return np.zeros_like(values)
+    return normalise(values)
+
+
+# A column of nodes (circles) showing a layer's output: each node is filled in
+# proportion to its value & labelled with the value.
+# The circles & labels are created once; set_values (or the UpdateNeurons
+# animation) changes the circles' fill colours in place (looked up for all
+# nodes at once from the palette) & the labels' glyphs.
+class NeuronColumn(VGroup):
+
+    def __init__(self, num_nodes, radius=0.23, buff=0.2, font_size=12
+                 , palette=NEURON_PALETTE):
+        self.palette = palette
+
+        # Create nodes & their labels
+        self.nodes = [
+            Circle(radius=radius
+                   , stroke_color=WHITE
+                   , stroke_width=0.7
+                   , fill_color=GRAY
+                   , fill_opacity=0)
+            for _ in range(num_nodes)
+        ]
+        self.labels = [NumberLabel(0.0, font_size=font_size) for _ in range(num_nodes)]
+
+        # Group each node with its label & arrange into a column
+        super().__init__(*[VGroup(node, label)
+                           for node, label in zip(self.nodes, self.labels)])
+        self.arrange(DOWN, buff=buff)
+        for node, label in zip(self.nodes, self.labels):
+            label.move_to(node)
+
+        self.values = np.zeros(num_nodes)
+        self.opacities = np.zeros(num_nodes)
+
+    # Colour the circles from the opacity array & copy the values into the
+    # labels
+    def apply_values(self):
+        colors = colormap_colors(self.opacities, self.palette)
+        for node, label, color, value in zip(self.nodes, self.labels
+                                             , colors, self.values):
+            node.fill_rgbas[:] = color
+            label.set_value(value)
+        return self
+
+    # Show a new layer output
+    def set_values(self, values):
+        values = np.asarray(values, dtype=np.float64).flatten()
+        self.opacities[:] = neuron_opacities(values)
+        self.values[:] = values
+        return self.apply_values()
+
+
+# Fades a column of nodes to a new layer output: the fill opacities and the
+# labelled values (counting up or down to the new values) are interpolated
+# together, as the two rows of one array
+class UpdateNeurons(ValueAnimation):
+
+    def __init__(self, column, values, **kwargs):
+        values = np.asarray(values, dtype=np.float64).flatten()
+        super().__init__(column, np.stack([neuron_opacities(values), values]), **kwargs)
+
+    def get_values(self):
+        return np.stack([self.mobject.opacities, self.mobject.values])
+
+    def set_values(self, values):
+        self.mobject.opacities[:] = values[0]
+        self.mobject.values[:] = values[1]
+        self.mobject.apply_values()
@@ -0,0 +1,199 @@
+# Relevant imports
+import inspect
+import numpy as np
+
+# Each optimizer updates a fixed list of parameters (weights & biases) in place
+# from their gradients, given in the same order:
+#   optimizer = Adam([w1, b1, w2, b2, w3, b3], learning_rate=0.001)
+#   optimizer.step([dL_dw1, dL_db1, dL_dw2, dL_db2, dL_dw3, dL_db3])
+# All state (momentum, running averages, scratch space) is allocated once when
+# the optimizer is created, so a step allocates no new arrays.
+
+
+# Plain gradient descent: w = w - learning_rate * dL_dw
+class SGD:
+
+    # Plain gradient descent only moves weights with a non-zero gradient, so
+    # with sparse input the first layer can skip the weight columns of zero
+    # pixels (see network.train_epoch). Optimizers that keep running averages
+    # move every weight on every step, so they set this to False.
+    sparse_updates = True
+
+    def __init__(self, params, learning_rate=0.01):
+        self.params = params
+        self.learning_rate = learning_rate
+        self.scratch = [np.zeros_like(param) for param in params]
+
+    def step(self, grads):
+        for param, grad, scratch in zip(self.params, grads, self.scratch):
+            np.multiply(grad, self.learning_rate, out=scratch)
+            param -= scratch
+
+    # State needed to resume training (see checkpoint.py)
+    def get_state(self):
+        return {}
+
+    def set_state(self, state):
+        pass
+
+
+# Gradient descent with momentum: a running (decaying) sum of past gradients
+# keeps the weights moving in a consistent direction
+#   v = momentum * v + dL_dw
+#   w = w - learning_rate * v
+class Momentum(SGD):
+
+    sparse_updates = False
+
+    def __init__(self, params, learning_rate=0.01, momentum=0.9):
+        super().__init__(params, learning_rate)
+        self.momentum = momentum
+        self.velocities = [np.zeros_like(param) for param in params]
+
+    def step(self, grads):
+        for param, grad, velocity, scratch in zip(self.params, grads
+                                                  , self.velocities
+                                                  , self.scratch):
+            velocity *= self.momentum
+            velocity += grad
+            np.multiply(velocity, self.learning_rate, out=scratch)
+            param -= scratch
+
+    def get_state(self):
+        return {f'velocity_{i}': velocity
+                for i, velocity in enumerate(self.velocities)}
+
+    def set_state(self, state):
+        for i, velocity in enumerate(self.velocities):
+            velocity[...] = state[f'velocity_{i}']
+
+
+# RMSProp: each weight's step is divided by a running average of its recent
+# gradient size, so weights with small gradients still move
+#   s = decay * s + (1 - decay) * dL_dw^2
+#   w = w - learning_rate * dL_dw / (sqrt(s) + epsilon)
+class RMSProp(SGD):
+
+    sparse_updates = False
+
+    def __init__(self, params, learning_rate=0.001, decay=0.9, epsilon=1e-8):
+        super().__init__(params, learning_rate)
+        self.decay = decay
+        self.epsilon = epsilon
+        self.squared_averages = [np.zeros_like(param) for param in params]
+
+    def step(self, grads):
+        for param, grad, squared_average, scratch in zip(self.params, grads
+                                                         , self.squared_averages
+                                                         , self.scratch):
+            # Update running average of squared gradients
+            np.multiply(grad, grad, out=scratch)
+            scratch *= 1 - self.decay
+            squared_average *= self.decay
+            squared_average += scratch
+
+            # Scaled step
+            np.sqrt(squared_average, out=scratch)
+            scratch += self.epsilon
+            np.divide(grad, scratch, out=scratch)
+            scratch *= self.learning_rate
+            param -= scratch
+
+    def get_state(self):
+        return {f'squared_average_{i}': squared_average
+                for i, squared_average in enumerate(self.squared_averages)}
+
+    def set_state(self, state):
+        for i, squared_average in enumerate(self.squared_averages):
+            squared_average[...] = state[f'squared_average_{i}']
+
+
+# Adam: momentum & RMSProp combined, with both running averages corrected for
+# starting at zero
+#   m = beta1 * m + (1 - beta1) * dL_dw
+#   v = beta2 * v + (1 - beta2) * dL_dw^2
+#   w = w - learning_rate * m_hat / (sqrt(v_hat) + epsilon)
+class Adam(SGD):
+
+    sparse_updates = False
+
+    def __init__(self, params, learning_rate=0.001, beta1=0.9, beta2=0.999
+                 , epsilon=1e-8):
+        super().__init__(params, learning_rate)
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        self.steps = 0
+        self.averages = [np.zeros_like(param) for param in params]
+        self.squared_averages = [np.zeros_like(param) for param in params]
+
+    def step(self, grads):
+        self.steps += 1
+
+        # Fold the bias corrections (m_hat = m / (1 - beta1^t),
+        # v_hat = v / (1 - beta2^t)) into the step size & epsilon
+        correction1 = 1 - self.beta1 ** self.steps
+        correction2 = np.sqrt(1 - self.beta2 ** self.steps)
+        step_size = self.learning_rate * correction2 / correction1
+        epsilon = self.epsilon * correction2
+
+        for param, grad, average, squared_average, scratch in zip(
+                self.params, grads, self.averages, self.squared_averages
+                , self.scratch):
+            # Update running average of gradients
+            np.multiply(grad, 1 - self.beta1, out=scratch)
+            average *= self.beta1
+            average += scratch
+
+            # Update running average of squared gradients
+            np.multiply(grad, grad, out=scratch)
+            scratch *= 1 - self.beta2
+            squared_average *= self.beta2
+            squared_average += scratch
+
+            # Scaled step
+            np.sqrt(squared_average, out=scratch)
+            scratch += epsilon
+            np.divide(average, scratch, out=scratch)
+            scratch *= step_size
+            param -= scratch
+
+    def get_state(self):
+        state = {"steps": np.array(self.steps)}
+        for i in range(len(self.params)):
+            state[f'average_{i}'] = self.averages[i]
+            state[f'squared_average_{i}'] = self.squared_averages[i]
+        return state
+
+    def set_state(self, state):
+        self.steps = int(state["steps"])
+        for i in range(len(self.params)):
+            self.averages[i][...] = state[f'average_{i}']
+            self.squared_averages[i][...] = state[f'squared_average_{i}']
+
+
+OPTIMIZERS = {
+    "sgd": SGD,
+    "momentum": Momentum,
+    "rmsprop": RMSProp,
+    "adam": Adam,
+}
+
+
+# The learning rate an optimizer trains with: learning_rate if given,
+# otherwise the optimizer's own default (e.g. 0.01 for SGD, 0.001 for Adam)
+def optimizer_learning_rate(name, learning_rate=None):
+    if name not in OPTIMIZERS:
+        raise ValueError(f'Unknown optimizer "{name}", '
+                         f'expected one of: {", ".join(OPTIMIZERS)}')
+    if learning_rate is None:
+        signature = inspect.signature(OPTIMIZERS[name])
+        learning_rate = signature.parameters["learning_rate"].default
+    return learning_rate
+
+
+# Create an optimizer by name ("sgd", "momentum", "rmsprop" or "adam"),
+# training with its own default learning rate unless one is given
+def create_optimizer(name, params, learning_rate=None):
+    learning_rate = optimizer_learning_rate(name, learning_rate)
+    return OPTIMIZERS[name](params, learning_rate=learning_rate)
@@ -0,0 +1,88 @@
+# Relevant imports
+from manim import *
+import numpy as np
+
+from value_animation import ValueAnimation
+
+
+# Colour (RGBA, in [0, 1]) of each pixel for a 2D array of values in [0, 1]:
+# the given colour with opacity = value
+def pixel_colors(values, color=WHITE):
+    values = np.asarray(values, dtype=np.float64)
+    colors = np.empty(values.shape + (4,))
+    colors[:, :, :3] = color_to_rgb(color)
+    colors[:, :, 3] = np.clip(values, 0, 1)
+    return colors
+
+
+# Shows a 2D array of values (e.g. a 28x28 MNIST digit) as a single image with
+# one image pixel per value, upscaled with nearest-neighbour sampling so each
+# value stays a sharp square. Optional grid lines outline each square.
+# Values are drawn in `color` with opacity = value, unless a colormap (a
+# function returning a (rows, cols, 4) RGBA array for an array of values) is
+# given.
+# The colours are held in one (rows, cols, 4) RGBA array; set_values (or the
+# UpdatePixelImage animation) writes it into the image in place.
+class PixelImage(Group):
+
+    def __init__(self, values, pixel_size, color=WHITE, grid_width=0
+                 , grid_color=BLUE, colormap=None):
+        self.color = color
+        self.colormap = colormap
+        self.colors = self.get_colors(values)
+        rows, cols = self.colors.shape[:2]
+
+        # Create image
+        self.image = ImageMobject(np.zeros((rows, cols, 4), dtype=np.uint8))
+        self.image.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        self.image.stretch_to_fit_width(cols * pixel_size)
+        self.image.stretch_to_fit_height(rows * pixel_size)
+        self.apply_colors()
+        super().__init__(self.image)
+
+        # Create grid lines (as one mobject, one path per line)
+        if grid_width > 0:
+            self.grid = VMobject(stroke_color=grid_color, stroke_width=grid_width)
+            left, top = self.image.get_corner(UL)[:2]
+            for row in range(rows + 1):
+                y = top - row * pixel_size
+                self.grid.start_new_path(np.array([left, y, 0]))
+                self.grid.add_line_to(np.array([left + cols * pixel_size, y, 0]))
+            for col in range(cols + 1):
+                x = left + col * pixel_size
+                self.grid.start_new_path(np.array([x, top, 0]))
+                self.grid.add_line_to(np.array([x, top - rows * pixel_size, 0]))
+            self.add(self.grid)
+
+    # Colour of each pixel for an array of values
+    def get_colors(self, values):
+        if self.colormap is not None:
+            return self.colormap(values)
+        return pixel_colors(values, self.color)
+
+    # Copy the colour array into the image's pixels
+    def apply_colors(self):
+        pixels = self.image.pixel_array
+        pixels[:] = np.rint(self.colors * 255)
+        self.image.orig_alpha_pixel_array[:] = pixels[:, :, 3]
+        return self
+
+    # Show a new array of values
+    def set_values(self, values):
+        self.colors[:] = self.get_colors(values)
+        return self.apply_colors()
+
+
+# Cross-fades a pixel image to a new array of values, interpolating the colour
+# array (the image's size, position & grid lines are left untouched)
+class UpdatePixelImage(ValueAnimation):
+
+    def __init__(self, pixel_image, values, **kwargs):
+        super().__init__(pixel_image, pixel_image.get_colors(values), **kwargs)
+
+    def get_values(self):
+        return self.mobject.colors.copy()
+
+    def set_values(self, colors):
+        self.mobject.colors[:] = colors
+        self.mobject.apply_colors()
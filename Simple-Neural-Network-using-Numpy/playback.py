@@ -0,0 +1,81 @@
+# Relevant imports
+from manim import *
+import numpy as np
+
+from heatmap import heatmap_colors
+
+
+# Plays back a recorded run of snapshots (e.g. the network's state before
+# training & after every epoch) as one continuous animation.
+# Every panel is given its whole stack of snapshots up front & follows a
+# single ValueTracker, `time`, which moves from snapshot 0 to the last one.
+# Between snapshots i and i + 1 (time = i + fraction) each panel shows a blend
+# of the two, computed by a vectorised updater, so no mobjects are created
+# while the run plays.
+#   playback = SnapshotPlayback(len(snapshots))
+#   playback.add_heatmap(heatmap, snapshots)   # (snapshots, rows, cols)
+#   playback.play(self, run_time=10)
+class SnapshotPlayback:
+
+    def __init__(self, snapshot_count):
+        self.snapshot_count = snapshot_count
+        self.time = ValueTracker(0)
+        self.mobjects = []
+
+    # Index of the snapshot before the current time & how far (0 to 1) the
+    # time is towards the next one
+    def position(self):
+        time = np.clip(self.time.get_value(), 0, self.snapshot_count - 1)
+        index = min(int(time), max(self.snapshot_count - 2, 0))
+        return index, time - index
+
+    # Update a mobject from the current time on every frame (starting now)
+    def follow(self, mobject, updater):
+        mobject.add_updater(updater, call_updater=True)
+        self.mobjects += [mobject]
+
+    # Blend a heatmap's colours between snapshots of its values
+    def add_heatmap(self, heatmap, snapshots):
+        self.add_colors(heatmap, np.stack([heatmap_colors(snapshot, heatmap.palette)
+                                           for snapshot in snapshots]))
+
+    # Blend a pixel_image.PixelImage's colours between snapshots of its values
+    def add_pixel_image(self, pixel_image, snapshots):
+        self.add_colors(pixel_image, np.stack([pixel_image.get_colors(snapshot)
+                                               for snapshot in snapshots]))
+
+    # Blend the colour array of a mobject with `colors` & `apply_colors()`
+    # (a Heatmap or PixelImage) between stacked snapshots of its colours
+    def add_colors(self, mobject, colors):
+        def update_colors(mobject):
+            index, fraction = self.position()
+            start = colors[index]
+            end = colors[min(index + 1, self.snapshot_count - 1)]
+            np.subtract(end, start, out=mobject.colors)
+            mobject.colors *= fraction
+            mobject.colors += start
+            mobject.apply_colors()
+
+        self.follow(mobject, update_colors)
+
+    # Show one value per snapshot on a glyph_label.NumberLabel, either counting
+    # smoothly between snapshots or switching to the nearest snapshot's value
+    def add_label(self, label, values, interpolate=False):
+        def update_label(mobject):
+            index, fraction = self.position()
+            if interpolate:
+                start = values[index]
+                end = values[min(index + 1, self.snapshot_count - 1)]
+                mobject.set_value(end if fraction >= 1 else start + fraction * (end - start))
+            else:
+                mobject.set_value(values[index + int(round(fraction))])
+
+        self.follow(label, update_label)
+
+    # Play the whole run in one animation, then detach the panels
+    def play(self, scene, run_time, rate_func=linear):
+        scene.play(self.time.animate.set_value(self.snapshot_count - 1)
+                   , run_time=run_time
+                   , rate_func=rate_func)
+        for mobject in self.mobjects:
+            mobject.clear_updaters()
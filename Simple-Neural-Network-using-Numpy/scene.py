@@ -1,113 +1,22 @@
 # Relevant imports
+import os
+import sys
 from manim import *
 import numpy as np
-import pandas as pd
-
-# Activation functions
-def relu(X):
-    return np.maximum(0,X)
-
-# def softmax(X):
-#     return np.exp(X)/sum(np.exp(X))
-
-# stable softmax
-def softmax(X):
-    Z = X - max(X)
-    numerator = np.exp(Z)
-    denominator = np.sum(numerator)
-    return numerator/denominator
-
-# Calculates the output of a given layer
-def calculate_layer_output(w, prev_layer_output, b, activation_type="relu"):
-    # Steps 1 & 2
-    g = w @ prev_layer_output + b
-
-    # Step 3
-    if activation_type == "relu":
-        return relu(g)
-    if activation_type == "softmax":
-        return softmax(g)
-
-# Initialize weights & biases
-def init_layer_params(row, col):
-    w = np.random.randn(row, col)
-    b = np.random.randn(row, 1)
-    return w, b
-
-# Calculate ReLU derivative
-def relu_derivative(g):
-    derivative = g.copy()
-    derivative[derivative <= 0] = 0
-    derivative[derivative > 0] = 1
-    return np.diag(derivative.T[0])
-
-def layer_backprop(previous_derivative, layer_output, previous_layer_output
-                   , w, activation_type="relu"):
-    # 1. Calculate the derivative of the activation func
-    dh_dg = None
-    if activation_type == "relu":
-        dh_dg = relu_derivative(layer_output)
-    elif activation_type == "softmax":
-        dh_dg = softmax_derivative(layer_output)
-
-    # 2. Apply chain rule to get derivative of Loss function with respect to:
-    dL_dg = dh_dg @ previous_derivative # activation function
-
-    # 3. Calculate the derivative of the linear function with respect to:
-    dg_dw = previous_layer_output.T     # a) weight matrix
-    dg_dh = w.T                         # b) previous layer output
-    dg_db = 1.0                         # c) bias vector
-
-    # 4. Apply chain rule to get derivative of Loss function with respect to:
-    dL_dw = dL_dg @ dg_dw               # a) weight matrix
-    dL_dh = dg_dh @ dL_dg               # b) previous layer output
-    dL_db = dL_dg * dg_db               # c) bias vector
-
-    return dL_dw, dL_dh, dL_db
-
-def gradient_descent(w, b, dL_dw, dL_db, learning_rate):
-    w -= learning_rate * dL_dw
-    b -= learning_rate * dL_db
-    return w, b
-
-def get_prediction(o):
-    return np.argmax(o)
-
-# Compute Accuracy (%) across all training data
-def compute_accuracy(train, label, w1, b1, w2, b2, w3, b3):
-    # Set params
-    correct = 0
-    total = train.shape[0]
-
-    # Iterate through training data
-    for index in range(0, total):
-        # Select a single data point (image)
-        X = train[index: index+1,:].T
-
-        # Forward pass: compute Output/Prediction (o)
-        h1 = calculate_layer_output(w1, X, b1, activation_type="relu")
-        h2 = calculate_layer_output(w2, h1, b2, activation_type="relu")
-        o = calculate_layer_output(w3, h2, b3, activation_type="softmax")
-
-        # If prediction matches label Increment correct count
-        if label[index] == get_prediction(o):
-            correct+=1
-
-    # Return Accuracy (%)
-    return (correct / total) * 100
-
-
-# Calculate Softmax derivative
-def softmax_derivative(o):
-    derivative = np.diag(o.T[0])
-
-    for i in range(len(derivative)):
-        for j in range(len(derivative)):
-            if i == j:
-                derivative[i][j] = o[i] * (1 - o[i])
-            else:
-                derivative[i][j] = -o[i] * o[j]
-    return derivative
+
+# Modules shared by every course (e.g. glyph_label.py) are in the repo root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from checkpoint import can_resume, save_checkpoint, load_checkpoint
+from connection_mesh import ConnectionMesh, UpdateConnections
+from dataset import load_mnist, split_validation
+from glyph_label import ChangeNumber, NumberLabel, create_status_counters
+from network import (calculate_layer_output, init_layer_params, layer_backprop
+                     , get_prediction, evaluate)
+from neuron_column import NeuronColumn, UpdateNeurons
+from optimizers import create_optimizer, optimizer_learning_rate
+from pixel_image import PixelImage, UpdatePixelImage
+from text_cache import cached_text
 
 
 class VisualiseNeuralNetwork(Scene):
@@ -118,40 +27,97 @@ class VisualiseNeuralNetwork(Scene):
     HEADER_HEIGHT = -3.5
     TRAINING_DATA_POINT = 1
 
+    # Palettes the nodes & connections are coloured with (see
+    # colormap.PALETTES)
+    NODE_PALETTE = "gray"
+    CONNECTION_PALETTE = "green_red"
+
+    # Precision used for the data, weights, activations & gradients
+    # (np.float32 halves the memory used & speeds up each epoch)
+    DTYPE = np.float64
+
+    # How the weights & biases are updated from their gradients: "sgd",
+    # "momentum", "rmsprop" or "adam" (see optimizers.py). A LEARNING_RATE of
+    # None trains with the optimizer's own default (0.01 for "sgd" &
+    # "momentum", 0.001 for "rmsprop" & "adam")
+    OPTIMIZER = "sgd"
+    LEARNING_RATE = None
+
+    # Fraction of the test images used to measure validation accuracy after
+    # each epoch (0 to skip validation). See dataset.split_validation.
+    VALIDATION_FRACTION = 0.1
+
+    # The training state is checkpointed to CHECKPOINT_FILE after every epoch.
+    # With RESUME set, an interrupted run carries on from its last completed
+    # epoch: completed epochs are replayed from the checkpoint (so Manim reuses
+    # their cached partial movies) rather than trained again. The checkpoint
+    # is deleted once training finishes. A checkpoint saved with different
+    # training settings is ignored & training starts again.
+    CHECKPOINT_FILE = "scene_checkpoint.npz"
+    RESUME = True
+
     def construct(self):
         ### INITIALISE NEURAL NET PARAMETERS ###
-        # Extract MNIST csv data into train & test variables
-        train = np.array(pd.read_csv('train.csv', delimiter=','))
-        test = np.array(pd.read_csv('test.csv', delimiter=','))
-
-        # Extract the first column of the training dataset into a label array
-        label = train[:, 0]
-        # The train dataset now becomes all columns except the first
-        train = train[:, 1:]
+        # Load MNIST train & test data (the csv files are cached as .npy files
+        # after the first run). Images are normalised as they are used.
+        train, label, test = load_mnist('train.csv', 'test.csv', dtype=self.DTYPE)
+        train, label, validation, validation_label = split_validation(
+            train, label, 'test.csv', self.VALIDATION_FRACTION)
 
         # Initialise vector of all zeroes with 10 columns and the same number
         # of rows as the label array
-        Y = np.zeros((label.shape[0], 10))
+        Y = np.zeros((label.shape[0], 10), dtype=self.DTYPE)
 
         # assign a value of 1 to each column index matching the label value
         Y[np.arange(0, label.shape[0]), label] = 1.0
 
-        # Normalize test & training dataset
-        train = train / 255
-        test = test / 255
-
         # Set hyperparameter(s)
-        learning_rate = 0.01
+        learning_rate = optimizer_learning_rate(self.OPTIMIZER, self.LEARNING_RATE)
 
         # Set other params
         epoch = 0
         previous_accuracy = 100
         accuracy = 0
-
-        # Randomly initialize weights & biases
-        w1, b1 = init_layer_params(10, 784)  # Hidden Layer 1
-        w2, b2 = init_layer_params(10, 10)  # Hidden Layer 2
-        w3, b3 = init_layer_params(10, 10)  # Output Layer
+        accuracies = []
+        validation_accuracies = []
+
+        # What was animated in each epoch (used to replay completed epochs
+        # after resuming)
+        history = {"h1": [], "h2": [], "o": [], "w2": [], "w3": []}
+
+        # Settings that change how the network trains (or which data point is
+        # animated), so a checkpoint is only resumed with the settings it was
+        # saved with
+        settings = {"dtype": np.dtype(self.DTYPE).name
+                    , "optimizer": self.OPTIMIZER
+                    , "learning_rate": learning_rate
+                    , "training_data_point": self.TRAINING_DATA_POINT
+                    , "validation_fraction": self.VALIDATION_FRACTION}
+
+        if self.RESUME and can_resume(self.CHECKPOINT_FILE, settings):
+            # Carry on from the last completed epoch of an interrupted run
+            params, epoch, accuracies, rng_state, arrays = load_checkpoint(self.CHECKPOINT_FILE)
+            w1, b1, w2, b2, w3, b3 = params
+            np.random.set_state(rng_state)
+            initial_w2, initial_w3 = arrays["initial_w2"], arrays["initial_w3"]
+            for key in history:
+                history[key] = list(arrays[f'history_{key}'])
+            validation_accuracies = list(arrays["validation_accuracies"])
+            optimizer_state = arrays
+        else:
+            # Randomly initialize weights & biases
+            w1, b1 = init_layer_params(10, 784, self.DTYPE)  # Hidden Layer 1
+            w2, b2 = init_layer_params(10, 10, self.DTYPE)  # Hidden Layer 2
+            w3, b3 = init_layer_params(10, 10, self.DTYPE)  # Output Layer
+            initial_w2, initial_w3 = w2.copy(), w3.copy()
+            optimizer_state = {}
+
+        # Create the optimizer, restoring its state (e.g. Adam's running
+        # averages) when resuming
+        optimizer = create_optimizer(self.OPTIMIZER, [w1, b1, w2, b2, w3, b3]
+                                     , learning_rate)
+        if optimizer_state:
+            optimizer.set_state(optimizer_state)
 
         ### CREATE SCENE ###
         # Create input image
@@ -168,8 +134,8 @@ class VisualiseNeuralNetwork(Scene):
         o_node_group, o_nodes_list = self.create_nodes(-3, 0.25, num_nodes)
 
         # Create connections
-        connections_1 = self.create_connections(h1_nodes_list, h2_nodes_list, w2)
-        connections_2 = self.create_connections(h2_nodes_list, o_nodes_list, w3)
+        connections_1 = self.create_connections(h1_nodes_list, h2_nodes_list, initial_w2)
+        connections_2 = self.create_connections(h2_nodes_list, o_nodes_list, initial_w3)
 
         # Create headers to distinguish the different layers & add to scene
         hidden_layer1_text = self.create_text("Hidden Layer 1"
@@ -198,18 +164,15 @@ class VisualiseNeuralNetwork(Scene):
         self.add(input_image_text)
 
         # Create prediction text & add to scene
-        prediction_text_group = self.create_prediction_text("...", -5.5)
+        prediction_text_group = self.create_prediction_text("...", -5)
         self.add(prediction_text_group)
 
-        # Create status text & add to scene
-        status_text = self.create_text(f'Epoch: {0}\nAccuracy: {0:.2f}%'
-                                       , self.HEADER_FONT_SIZE
-                                       , -5.5
-                                       , -3)
-        self.add(status_text)
+        # Create status counters & add to scene
+        status, status_labels = create_status_counters(len(validation_label) > 0, self.HEADER_FONT_SIZE, -5.5, -3)
+        self.add(status)
 
         # Animate creation of nodes & connections
-        self.play(Create(input_image)
+        self.play(FadeIn(input_image)
                   , Create(h1_node_group)
                   , Create(h2_node_group)
                   , Create(connections_1)
@@ -218,6 +181,22 @@ class VisualiseNeuralNetwork(Scene):
                   )
 
         ### NEURAL NET TRAINING ###
+        # Replay epochs completed before the run was interrupted
+        for completed_epoch in range(epoch):
+            self.animate_training_data_point(
+                input_image, training_image
+                , history["h1"][completed_epoch], history["h2"][completed_epoch]
+                , history["o"][completed_epoch]
+                , history["w2"][completed_epoch], history["w3"][completed_epoch]
+                , h1_node_group, h2_node_group, o_node_group
+                , connections_1, connections_2, prediction_text_group)
+            self.animate_status(status_labels, completed_epoch + 1
+                                , accuracies[completed_epoch]
+                                , validation_accuracies[completed_epoch])
+        if epoch > 0:
+            previous_accuracy = accuracies[-2] if epoch > 1 else 0
+            accuracy = accuracies[-1]
+
         # While:
         #  1. Accuracy is improving by 1% or more per epoch, and
         #  2. There are 20 epochs or less
@@ -256,132 +235,96 @@ class VisualiseNeuralNetwork(Scene):
                                                      , "relu")
 
                 # 4. Update weights & biases
-                w1, b1 = gradient_descent(w1, b1, dL1_dw1, dL1_db1, learning_rate)
-                w2, b2 = gradient_descent(w2, b2, dL2_dw2, dL2_db2, learning_rate)
-                w3, b3 = gradient_descent(w3, b3, dL3_dw3, dL3_db3, learning_rate)
+                optimizer.step([dL1_dw1, dL1_db1, dL2_dw2, dL2_db2
+                                , dL3_dw3, dL3_db3])
 
                 # Decide whether to animate
                 animate = True if index == self.TRAINING_DATA_POINT else False
 
                 # Animate change
                 if animate:
-                    self.animate_input_image(input_image, X, 5)
-                    self.animate_nodes(h1_node_group, h1, 3, 0.25, num_nodes)
-                    self.animate_nodes(h2_node_group, h2, 0, 0.25, num_nodes)
-                    self.animate_connections(h1_nodes_list, h2_nodes_list
-                                             , connections_1, w2)
-                    self.animate_nodes(o_node_group, o, -3, 0.25, num_nodes)
-                    self.animate_connections(h2_nodes_list, o_nodes_list
-                                             , connections_2, w3)
-                    self.animate_prediction_text(prediction_text_group
-                                                 , get_prediction(o), -5)
-
-            # Compute & print Accuracy (%)
-            accuracy = compute_accuracy(train, label, w1, b1, w2, b2, w3, b3)
-            print(f'Accuracy: {accuracy:.2f} %')
+                    self.animate_training_data_point(
+                        input_image, X, h1, h2, o, w2, w3
+                        , h1_node_group, h2_node_group, o_node_group
+                        , connections_1, connections_2, prediction_text_group)
+
+                    # Record what was animated
+                    history["h1"] += [h1.copy()]
+                    history["h2"] += [h2.copy()]
+                    history["o"] += [o.copy()]
+                    history["w2"] += [w2.copy()]
+                    history["w3"] += [w3.copy()]
+
+            # Compute & print Accuracy (%) and mean loss
+            accuracy, _, loss = evaluate(train, label, w1, b1, w2, b2, w3, b3)
+            print(f'Accuracy: {accuracy:.2f} %, Loss: {loss:.4f}')
+            accuracies += [accuracy]
+
+            # Compute & print validation Accuracy (%) on the held out images
+            validation_accuracy = np.nan
+            if len(validation_label) > 0:
+                validation_accuracy, _, validation_loss = evaluate(
+                    validation, validation_label, w1, b1, w2, b2, w3, b3)
+                print(f'Validation Accuracy: {validation_accuracy:.2f} %, '
+                      f'Loss: {validation_loss:.4f}')
+            validation_accuracies += [validation_accuracy]
 
             # Increment epoch
             epoch += 1
-            self.animate_text(status_text
-                            , f'Epoch: {epoch}\nAccuracy: {accuracy:.2f}%'
-                            , self.HEADER_FONT_SIZE
-                            , -5.5
-                            , -3)
+
+            # Save a checkpoint to resume from
+            save_checkpoint(self.CHECKPOINT_FILE, [w1, b1, w2, b2, w3, b3]
+                            , epoch, accuracies, settings
+                            , initial_w2=initial_w2, initial_w3=initial_w3
+                            , validation_accuracies=np.array(validation_accuracies)
+                            , **{f'history_{key}': np.array(value)
+                               for key, value in history.items()}
+                            , **optimizer.get_state())
+
+            self.animate_status(status_labels, epoch, accuracy, validation_accuracy)
+
+        # Training finished, so there is nothing left to resume
+        if os.path.exists(self.CHECKPOINT_FILE):
+            os.remove(self.CHECKPOINT_FILE)
+
         self.wait(2)
 
     # Create Methods
     def create_input_image(self, training_image, left_shift):
         # Initialise params
-        square_count = training_image.shape[0]
-        rows = np.sqrt(square_count)
-
-        # Create list of squares to represent pixels
-        squares = [
-            Square(fill_color=WHITE
-                   , fill_opacity=training_image[i]
-                   , stroke_width=0.5).scale(0.03)
-            for i in range(square_count)
-        ]
+        rows = int(np.sqrt(training_image.shape[0]))
 
-        # Place all the squares into a VGroup and arrange into a 28x28 grid
-        group = VGroup(*squares).arrange_in_grid(rows=int(rows), buff=0)
+        # Show the pixels as a single 28x28 image with grid lines
+        image = PixelImage(training_image.reshape(rows, rows), 0.06
+                           , grid_width=0.5)
 
         # Shift into correct position in the scene
-        group.shift(left_shift * LEFT)
+        image.shift(left_shift * LEFT)
 
-        return group
+        return image
 
     def create_nodes(self, left_shift, down_shift, num_nodes, layer_output=None):
-        # Create VGroup & list to hold created nodes
-        node_group = VGroup()
-        nodes = []
-
-        # Create list of circles to represent nodes
-        for i in range(num_nodes):
-            # Set fill opacity to 0
-            opacity = 0.0
-            text = "0.0"
-            # If a layer output has been passed and the max value is not 0
-            if layer_output is not None and np.max(layer_output) != 0.0:
-                # Set opacity as normalised layer output value
-                opacity = (layer_output[i] / np.max(np.absolute(layer_output)))[0]
-                # Set text as layer output
-                text = f'{layer_output[i][0]:.1f}'
-
-            # Create node
-            node = Circle(radius=0.23
-                , stroke_color=WHITE
-                , stroke_width=0.7
-                , fill_color=GRAY
-                , fill_opacity=opacity
-                )
-
-            # Add to nodes list
-            nodes += [node]
-
-            fill_text = Text(text, font_size=12)
-            # Position fill text in circle
-            fill_text.move_to(node)
-
-            # Group fill text and node and add to node_group
-            group = VGroup(node, fill_text)
-            node_group.add(group)
-
-
-        # Arrange & position node_group
-        node_group.arrange(DOWN, buff=0.2)
+        # Create column of nodes (circles labelled with their values)
+        node_group = NeuronColumn(num_nodes, palette=self.NODE_PALETTE)
+        if layer_output is not None:
+            node_group.set_values(layer_output)
+
+        # Position node_group
         node_group.shift(left_shift * LEFT).shift(down_shift * DOWN)
 
-        return node_group, nodes
+        return node_group, node_group.nodes
 
     def create_connections(self, left_layer_nodes, right_layer_nodes, w):
-        # Create VGroup to hold created connections
-        connection_group = VGroup()
-
-        # Iterate through right layer nodes
-        for l in range(len(right_layer_nodes)):
-            # Iterate through left layer nodes
-            for r in range(len(left_layer_nodes)):
-                # Calculate opacity from normalised weight matrix values
-                opacity = 0.0 if np.max(np.absolute(w[l, :])) == 0.0 \
-                    else w[l, r] / np.max(np.absolute(w[l, :]))
-                # Set colour
-                colour = GREEN if opacity >= 0 else RED
-
-                # Create connection line
-                line = Line(start=right_layer_nodes[l].get_edge_center(LEFT)
-                            , end=left_layer_nodes[r].get_edge_center(RIGHT)
-                            , color=colour
-                            , stroke_opacity=abs(opacity)
-                            )
-
-                # Add to connection group
-                connection_group.add(line)
-        return connection_group
+        # Connect the right edge of each left layer node to the left edge of
+        # each right layer node (coloured & faded by the weight between them)
+        left_points = [node.get_edge_center(RIGHT) for node in left_layer_nodes]
+        right_points = [node.get_edge_center(LEFT) for node in right_layer_nodes]
+        return ConnectionMesh(left_points, right_points, w
+                              , palette=self.CONNECTION_PALETTE)
 
     def create_text(self, text, font_size, left_shift, down_shift):
         # Create text
-        text = Text(text, font_size=font_size)
+        text = cached_text(text, font_size=font_size)
 
         # Position text
         text.shift(left_shift * LEFT)
@@ -394,7 +337,7 @@ class VisualiseNeuralNetwork(Scene):
         prediction_text_group = VGroup()
 
         # Create & position text
-        prediction_text = Text(f'{prediction}', font_size=40)
+        prediction_text = NumberLabel(prediction, '{}', font_size=40)
         prediction_text.shift(left_shift * LEFT)
 
         # Create text box (helps with positioning Prediction Header)
@@ -404,8 +347,8 @@ class VisualiseNeuralNetwork(Scene):
         prediction_text_box.move_to(prediction_text)
 
         # Create Header Text
-        prediction_header = Text("Prediction"
-                                 , font_size=self.HEADER_FONT_SIZE)
+        prediction_header = cached_text("Prediction"
+                                        , font_size=self.HEADER_FONT_SIZE)
         prediction_header.next_to(prediction_text_box, UP)
 
         # Group items
@@ -416,52 +359,49 @@ class VisualiseNeuralNetwork(Scene):
         return prediction_text_group
 
     # Animate Methods
-    def animate_input_image(self, input_image, X, left_shift):
-        # 1. Create input image with new parameters
-        new_input_image = self.create_input_image(X, left_shift)
-        # 2. Transform old input image to new image
-        self.play(Transform(input_image, new_input_image)
+    def animate_input_image(self, input_image, X):
+        # Cross-fade the input image to the new pixels
+        rows = int(np.sqrt(X.shape[0]))
+        self.play(UpdatePixelImage(input_image, X.reshape(rows, rows))
                   , run_time=self.ANIMATION_RUN_TIME)
 
-    def animate_nodes(self, layer_group, layer_output
-                      , left_shift, down_shift, num_neurons):
-        # 1. Create nodes with new parameters
-        new_layer_group, _ = self.create_nodes(left_shift
-                                               , down_shift
-                                               , num_neurons
-                                               , layer_output)
-        # 2. Transform old nodes to new nodes
-        self.play(Transform(layer_group, new_layer_group)
+    def animate_nodes(self, layer_group, layer_output):
+        # Fade the nodes & count their labels to the new layer output
+        self.play(UpdateNeurons(layer_group, layer_output)
                   , run_time=self.ANIMATION_RUN_TIME)
 
-    def animate_connections(self, left_layer_centers, right_layer_centers
-                            , line_group, w):
-        # 1. Create connections with new parameters
-        new_line_group = self.create_connections(left_layer_centers
-                                                 , right_layer_centers
-                                                 , w)
-        # 2. Transform old connections to new connections
-        self.play(Transform(line_group, new_line_group)
+    def animate_connections(self, connections, w):
+        # Fade the connections' colours to the new weights
+        self.play(UpdateConnections(connections, w)
                   , run_time=self.ANIMATION_RUN_TIME)
 
-    def animate_text(self, text, new_string, font_size, left_shift, down_shift):
-        # 1. Create text with new parameters
-        new_text = self.create_text(new_string
-                                    , font_size
-                                    , left_shift
-                                    , down_shift)
-        # 2. Transform old text to new text
-        self.play(Transform(text, new_text)
+    # Animate the network processing the tracked training data point
+    def animate_training_data_point(self, input_image, X, h1, h2, o, w2, w3
+                                    , h1_node_group, h2_node_group, o_node_group
+                                    , connections_1, connections_2
+                                    , prediction_text_group):
+        self.animate_input_image(input_image, X)
+        self.animate_nodes(h1_node_group, h1)
+        self.animate_nodes(h2_node_group, h2)
+        self.animate_connections(connections_1, w2)
+        self.animate_nodes(o_node_group, o)
+        self.animate_connections(connections_2, w3)
+        self.animate_prediction_text(prediction_text_group, get_prediction(o))
+
+    # Update the status counters after an epoch, counting the accuracies up
+    # (or down) to their new values (validation accuracy is NaN when
+    # validation is skipped)
+    def animate_status(self, status_labels, epoch, accuracy, validation_accuracy):
+        values = [epoch, float(accuracy), float(validation_accuracy)]
+        self.play(*[ChangeNumber(label, value, interpolate)
+                    for label, value, interpolate in zip(status_labels, values, [False, True, True])
+                    if not np.isnan(value)]
                   , run_time=self.ANIMATION_RUN_TIME)
 
-    def animate_prediction_text(self, prediction_text_group, prediction, left_shift):
-        # 1. Create prediction text with new parameters
-        new_prediction_text_group = self.create_prediction_text(prediction
-                                                                , left_shift)
-        # 2. Transform old prediction text to new prediction text
-        self.play(Transform(prediction_text_group, new_prediction_text_group)
+    def animate_prediction_text(self, prediction_text_group, prediction):
+        # Switch the prediction's glyphs to the new digit
+        self.play(ChangeNumber(prediction_text_group[1], prediction, interpolate=False)
                   , run_time=self.ANIMATION_RUN_TIME)
-        # self.play(Circumscribe(prediction_text, Circle))
 
 
 
@@ -1,113 +1,23 @@
 # Relevant imports
+import os
+import sys
 from manim import *
 import numpy as np
-import pandas as pd
-
-# Activation functions
-def relu(X):
-    return np.maximum(0,X)
-
-# def softmax(X):
-#     return np.exp(X)/sum(np.exp(X))
-
-# stable softmax
-def softmax(X):
-    Z = X - max(X)
-    numerator = np.exp(Z)
-    denominator = np.sum(numerator)
-    return numerator/denominator
-
-# Calculates the output of a given layer
-def calculate_layer_output(w, prev_layer_output, b, activation_type="relu"):
-    # Steps 1 & 2
-    g = w @ prev_layer_output + b
-
-    # Step 3
-    if activation_type == "relu":
-        return relu(g)
-    if activation_type == "softmax":
-        return softmax(g)
-
-# Initialize weights & biases
-def init_layer_params(row, col):
-    w = np.random.randn(row, col)
-    b = np.random.randn(row, 1)
-    return w, b
-
-# Calculate ReLU derivative
-def relu_derivative(g):
-    derivative = g.copy()
-    derivative[derivative <= 0] = 0
-    derivative[derivative > 0] = 1
-    return np.diag(derivative.T[0])
-
-def layer_backprop(previous_derivative, layer_output, previous_layer_output
-                   , w, activation_type="relu"):
-    # 1. Calculate the derivative of the activation func
-    dh_dg = None
-    if activation_type == "relu":
-        dh_dg = relu_derivative(layer_output)
-    elif activation_type == "softmax":
-        dh_dg = softmax_derivative(layer_output)
-
-    # 2. Apply chain rule to get derivative of Loss function with respect to:
-    dL_dg = dh_dg @ previous_derivative # activation function
-
-    # 3. Calculate the derivative of the linear function with respect to:
-    dg_dw = previous_layer_output.T     # a) weight matrix
-    dg_dh = w.T                         # b) previous layer output
-    dg_db = 1.0                         # c) bias vector
-
-    # 4. Apply chain rule to get derivative of Loss function with respect to:
-    dL_dw = dL_dg @ dg_dw               # a) weight matrix
-    dL_dh = dg_dh @ dL_dg               # b) previous layer output
-    dL_db = dL_dg * dg_db               # c) bias vector
-
-    return dL_dw, dL_dh, dL_db
-
-def gradient_descent(w, b, dL_dw, dL_db, learning_rate):
-    w -= learning_rate * dL_dw
-    b -= learning_rate * dL_db
-    return w, b
-
-def get_prediction(o):
-    return np.argmax(o)
-
-# Compute Accuracy (%) across all training data
-def compute_accuracy(train, label, w1, b1, w2, b2, w3, b3):
-    # Set params
-    correct = 0
-    total = train.shape[0]
-
-    # Iterate through training data
-    for index in range(0, total):
-        # Select a single data point (image)
-        X = train[index: index+1,:].T
-
-        # Forward pass: compute Output/Prediction (o)
-        h1 = calculate_layer_output(w1, X, b1, activation_type="relu")
-        h2 = calculate_layer_output(w2, h1, b2, activation_type="relu")
-        o = calculate_layer_output(w3, h2, b3, activation_type="softmax")
-
-        # If prediction matches label Increment correct count
-        if label[index] == get_prediction(o):
-            correct+=1
-
-    # Return Accuracy (%)
-    return (correct / total) * 100
-
-
-# Calculate Softmax derivative
-def softmax_derivative(o):
-    derivative = np.diag(o.T[0])
-
-    for i in range(len(derivative)):
-        for j in range(len(derivative)):
-            if i == j:
-                derivative[i][j] = o[i] * (1 - o[i])
-            else:
-                derivative[i][j] = -o[i] * o[j]
-    return derivative
+
+# Modules shared by every course (e.g. glyph_label.py) are in the repo root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from animation_batch import AnimationBatch, play_or_add
+from checkpoint import can_resume, save_checkpoint, load_checkpoint
+from dataset import load_mnist, split_validation, to_sparse
+from glyph_label import ChangeNumber, NumberLabel, create_status_counters
+from heatmap import Heatmap, UpdateHeatmap, heatmap_image_colors
+from network import init_layer_params, evaluate, snapshot_activations, train_epoch
+from optimizers import create_optimizer, optimizer_learning_rate
+from pixel_image import PixelImage, UpdatePixelImage
+from playback import SnapshotPlayback
+from text_cache import cached_text
+from training_trace import TrainingTrace, load_trace
 
 
 class VisualiseNeuralNetwork(Scene):
@@ -120,6 +30,81 @@ class VisualiseNeuralNetwork(Scene):
     HEADER_HEIGHT = -3.6
     HEATMAP_SQUARE_SCALE = 0.07
 
+    # Palette the heatmaps & receptive fields are coloured with (see
+    # colormap.PALETTES)
+    HEATMAP_PALETTE = "green_red"
+
+    # With CONTINUOUS_PLAYBACK set, the network is trained (or the trace
+    # loaded) first & the whole run is then played as one continuous
+    # animation, blending smoothly from each epoch to the next
+    # (EPOCH_RUN_TIME seconds per epoch). Every heatmap cell is blended, so
+    # HEATMAP_CHANGE_THRESHOLD & EPOCH_LAG_RATIO don't apply, and the run is a
+    # single partial movie: an interrupted render has none of it cached.
+    # Otherwise (the default) each epoch is animated as soon as it's
+    # trained: all of an epoch's heatmap, receptive field, prediction & status
+    # text updates are played together in one animation lasting
+    # EPOCH_RUN_TIME seconds. Each update starts EPOCH_LAG_RATIO of the way
+    # through the previous one (0 plays them all at once, each stretched over
+    # the whole EPOCH_RUN_TIME). An EPOCH_RUN_TIME of None gives each update
+    # ANIMATION_RUN_TIME seconds, so the default keeps the original pacing:
+    # the updates are played one after another at one ANIMATION_RUN_TIME
+    # each, however many of them there are (see epoch_run_time).
+    CONTINUOUS_PLAYBACK = False
+    EPOCH_RUN_TIME = None
+    EPOCH_LAG_RATIO = 1.0
+
+    # Heatmap cells whose colour/opacity changes by less than this between
+    # epochs are updated without being animated (None animates every cell)
+    HEATMAP_CHANGE_THRESHOLD = 0.02
+
+    # Number of training images per weight update (1 = per-sample training)
+    BATCH_SIZE = 1
+
+    # Precision used for the data, weights, activations & gradients
+    # (np.float32 halves the memory used & speeds up each epoch)
+    DTYPE = np.float64
+
+    # Train on a sparse (CSR) copy of the images so the first layer only
+    # touches the weights of non-zero pixels. With BATCH_SIZE = 1 this runs
+    # about as fast as dense training (the small layers' per-sample overhead
+    # dominates); dense matrix products are faster for larger batches. Only
+    # "sgd" skips the zero pixels' weights, the other optimizers update all of
+    # them. See benchmark_sparse.py.
+    SPARSE_INPUT = False
+
+    # How the weights & biases are updated from their gradients: "sgd",
+    # "momentum", "rmsprop" or "adam" (see optimizers.py). A LEARNING_RATE of
+    # None trains with the optimizer's own default (0.01 for "sgd" &
+    # "momentum", 0.001 for "rmsprop" & "adam")
+    OPTIMIZER = "sgd"
+    LEARNING_RATE = None
+
+    # Fraction of the test images used to measure validation accuracy after
+    # each epoch (0 to skip validation). See dataset.split_validation.
+    VALIDATION_FRACTION = 0.1
+
+    # Training runs are recorded to TRACE_FILE. With REPLAY_TRACE set, the
+    # recorded run is animated instead of training the network again.
+    TRACE_FILE = "training_trace.npz"
+    REPLAY_TRACE = False
+
+    # The training state is checkpointed to CHECKPOINT_FILE after every epoch.
+    # With RESUME set, an interrupted run carries on from its last completed
+    # epoch: completed epochs are replayed from the trace (so, without
+    # CONTINUOUS_PLAYBACK, Manim reuses their cached partial movies) rather
+    # than trained again. The checkpoint
+    # is deleted once training finishes. A checkpoint saved with different
+    # training settings (see checkpoint_settings), or without its trace, is
+    # ignored & training starts again.
+    CHECKPOINT_FILE = "training_checkpoint.npz"
+    RESUME = True
+
+    # Show each hidden layer 1 node's weights (a row of w1) as a 28x28 image,
+    # the pixels it responds to, updated every epoch
+    SHOW_RECEPTIVE_FIELDS = True
+    RECEPTIVE_FIELD_PIXEL_SIZE = 0.011
+    RECEPTIVE_FIELDS_PLACEMENT = [0, -2.45]
+
     TRAINING_DATA_POINTS = [1, 0, 24, 13, 32, 8, 21, 6, 10, 11]
     DIGIT_X_PLACEMENTS = [5.5, 4.75, 4, 3.25, 2.5, 5.5, 4.75, 4, 3.25, 2.5]
     DIGIT_Y_PLACEMENTS = [-2, -2, -2, -2, -2, 2.5, 2.5, 2.5, 2.5, 2.5]
@@ -149,6 +134,7 @@ class VisualiseNeuralNetwork(Scene):
     HEATMAP_W3H2    = None
     HEATMAP_O       = None
     HEATMAP_B3      = None
+    RECEPTIVE_FIELDS = None
     PREDICTIONS_OBJECTS = []
 
     OUTPUT_H1 = np.zeros((10, 10))
@@ -160,38 +146,51 @@ class VisualiseNeuralNetwork(Scene):
 
     def construct(self):
         ### INITIALISE NEURAL NET PARAMETERS ###
-        # Extract MNIST csv data into train & test variables
-        train = np.array(pd.read_csv('train.csv', delimiter=','))
-        test = np.array(pd.read_csv('test.csv', delimiter=','))
-
-        # Extract the first column of the training dataset into a label array
-        label = train[:, 0]
-        # The train dataset now becomes all columns except the first
-        train = train[:, 1:]
-
-        # Initialise vector of all zeroes with 10 columns and the same number
-        # of rows as the label array
-        Y = np.zeros((label.shape[0], 10))
-
-        # assign a value of 1 to each column index matching the label value
-        Y[np.arange(0, label.shape[0]), label] = 1.0
-
-        # Normalize test & training dataset
-        train = train / 255
-        test = test / 255
-
-        # Set hyperparameter(s)
-        learning_rate = 0.01
-
-        # Set other params
-        epoch = 0
-        previous_accuracy = 100
-        accuracy = 0
-
-        # Randomly initialize weights & biases
-        w1, b1 = init_layer_params(10, 784)  # Hidden Layer 1
-        w2, b2 = init_layer_params(10, 10)  # Hidden Layer 2
-        w3, b3 = init_layer_params(10, 10)  # Output Layer
+        if self.REPLAY_TRACE:
+            # Replay a previously recorded training run, no training needed
+            trace = load_trace(self.TRACE_FILE)
+            epochs = iter(trace)
+            show_validation = len(trace) > 0 and not np.isnan(trace[-1]["validation_accuracy"])
+        else:
+            # Load MNIST train & test data (the csv files are cached as .npy files
+            # after the first run). Images are normalised as they are used.
+            train, label, test = load_mnist('train.csv', 'test.csv', dtype=self.DTYPE)
+            train, label, validation, validation_label = split_validation(
+                train, label, 'test.csv', self.VALIDATION_FRACTION)
+            show_validation = len(validation_label) > 0
+
+            # Initialise vector of all zeroes with 10 columns and the same number
+            # of rows as the label array
+            Y = np.zeros((label.shape[0], 10), dtype=self.DTYPE)
+
+            # assign a value of 1 to each column index matching the label value
+            Y[np.arange(0, label.shape[0]), label] = 1.0
+
+            if self.RESUME and can_resume(self.CHECKPOINT_FILE, self.checkpoint_settings()
+                                          , required_files=[self.TRACE_FILE]):
+                # Carry on from the last completed epoch of an interrupted run
+                params, completed_epochs, _, rng_state, optimizer_state = load_checkpoint(self.CHECKPOINT_FILE)
+                w1, b1, w2, b2, w3, b3 = params
+                np.random.set_state(rng_state)
+                trace = load_trace(self.TRACE_FILE)
+                trace.truncate(completed_epochs)
+            else:
+                # Randomly initialize weights & biases
+                w1, b1 = init_layer_params(10, 784, self.DTYPE)  # Hidden Layer 1
+                w2, b2 = init_layer_params(10, 10, self.DTYPE)  # Hidden Layer 2
+                w3, b3 = init_layer_params(10, 10, self.DTYPE)  # Output Layer
+                trace = TrainingTrace(train[self.TRAINING_DATA_POINTS], w1, w2, b2, w3, b3)
+                optimizer_state = {}
+
+            # Train the network one epoch at a time, recording each epoch
+            epochs = self.train_network(train, label, Y, w1, b1, w2, b2, w3, b3, trace
+                                        , optimizer_state
+                                        , validation, validation_label)
+
+        # Weights & biases to show before training starts
+        w1 = trace.initial["w1"]
+        w2, b2 = trace.initial["w2"], trace.initial["b2"]
+        w3, b3 = trace.initial["w3"], trace.initial["b3"]
 
         ### CREATE SCENE ###
         h2_to_h2_arrow = VGroup()
@@ -199,16 +198,13 @@ class VisualiseNeuralNetwork(Scene):
 
         for i in range(len(self.TRAINING_DATA_POINTS)):
             # Create input image
-            training_image = train[
-                                self.TRAINING_DATA_POINTS[i]:self.TRAINING_DATA_POINTS[i] + 1
-                                , :
-                             ].T
+            training_image = trace.images[i:i + 1, :].T
             self.INPUT_IMAGES += [self.create_input_image(training_image, self.DIGIT_X_PLACEMENTS[i], self.DIGIT_Y_PLACEMENTS[i])]
             # Create header for input image & add to scene
             input_image_text = self.create_text("Input", self.HEADER_2_FONT_SIZE, 0 , 0)
             input_image_text.next_to(self.INPUT_IMAGES[i], 0.5 * UP)
 
-            self.play(Create(self.INPUT_IMAGES[i])
+            self.play(FadeIn(self.INPUT_IMAGES[i])
                       , Write(input_image_text)
                       , run_time=self.ANIMATION_RUN_TIME)
 
@@ -288,14 +284,159 @@ class VisualiseNeuralNetwork(Scene):
         self.add(hidden_layer2_text)
         self.add(output_text)
 
-        # Create status text & add to scene
-        status_text = self.create_text(f'Epoch: {0}\nAccuracy: {0:.2f}%'
-                                       , self.HEADER_FONT_SIZE
-                                       , -6.15
-                                       , -3.65)
-        self.add(status_text)
+        # Create hidden layer 1 receptive fields
+        if self.SHOW_RECEPTIVE_FIELDS:
+            self.RECEPTIVE_FIELDS = self.create_receptive_fields(w1, self.RECEPTIVE_FIELDS_PLACEMENT[0], self.RECEPTIVE_FIELDS_PLACEMENT[1])
+            self.play(FadeIn(self.RECEPTIVE_FIELDS), run_time=self.ANIMATION_RUN_TIME)
 
         ## NEURAL NET TRAINING ###
+        if self.CONTINUOUS_PLAYBACK:
+            # Train (or load) every epoch, then play the whole run at once
+            self.play_run(list(epochs), trace.initial)
+        else:
+            # Create status counters & add to scene
+            status, status_labels = create_status_counters(show_validation, self.HEADER_FONT_SIZE, -6.15, -3.5)
+            self.add(status)
+
+            for epoch, state in enumerate(epochs):
+                # Set animation parameters
+                w1 = state["w1"]
+                w2, b2, w3, b3 = state["w2"], state["b2"], state["w3"], state["b3"]
+                self.OUTPUT_PREDICTIONS = state["predictions"]
+                self.OUTPUT_H1[:] = state["h1"]
+                self.OUTPUT_W2H1[:] = state["w2h1"]
+                self.OUTPUT_H2[:] = state["h2"]
+                self.OUTPUT_W3H2[:] = state["w3h2"]
+                self.OUTPUT_O[:] = state["o"]
+
+                # Animate Changes (all played together once the batch ends)
+                with AnimationBatch(self, self.EPOCH_RUN_TIME, self.EPOCH_LAG_RATIO) as batch:
+                    # Hidden Layer 2
+                    self.animate_heatmap(self.HEATMAP_W2, w2, batch)
+                    self.animate_heatmap(self.HEATMAP_B2, b2, batch)
+                    self.animate_heatmap(self.HEATMAP_H1, self.OUTPUT_H1, batch)
+                    self.animate_heatmap(self.HEATMAP_W2H1, self.OUTPUT_W2H1, batch)
+                    self.animate_heatmap(self.HEATMAP_H2_2, self.OUTPUT_H2, batch)
+
+                    # Output Layer
+                    self.animate_heatmap(self.HEATMAP_H2, self.OUTPUT_H2, batch)
+                    self.animate_heatmap(self.HEATMAP_W3H2, self.OUTPUT_W3H2, batch)
+                    self.animate_heatmap(self.HEATMAP_O, self.OUTPUT_O, batch)
+                    self.animate_heatmap(self.HEATMAP_W3, w3, batch)
+                    self.animate_heatmap(self.HEATMAP_B3, b3, batch)
+
+                    # Hidden Layer 1 receptive fields
+                    if self.RECEPTIVE_FIELDS is not None:
+                        self.animate_receptive_fields(self.RECEPTIVE_FIELDS, w1, batch)
+
+                    for i in range(len(self.OUTPUT_PREDICTIONS)):
+                        self.animate_prediction_text(self.PREDICTIONS_OBJECTS[i], self.OUTPUT_PREDICTIONS[i], batch)
+
+                    # Update status counters
+                    self.animate_status(status_labels, epoch + 1, state["accuracy"], state["validation_accuracy"], batch)
+
+        self.wait(3)
+
+    # Play a whole training run as one continuous animation: every heatmap,
+    # prediction & status counter is given all its per-epoch snapshots (after
+    # the state before training) & follows one time tracker
+    def play_run(self, states, initial):
+        if not states:
+            return
+        playback = SnapshotPlayback(len(states) + 1)
+
+        # Stack the state before training & after every epoch
+        def snapshots(key, start):
+            return np.stack([start] + [state[key] for state in states])
+
+        # Heatmaps
+        for heatmap, key, start in [(self.HEATMAP_W2, "w2", initial["w2"])
+                                    , (self.HEATMAP_B2, "b2", initial["b2"])
+                                    , (self.HEATMAP_H1, "h1", self.OUTPUT_H1)
+                                    , (self.HEATMAP_W2H1, "w2h1", self.OUTPUT_W2H1)
+                                    , (self.HEATMAP_H2_2, "h2", self.OUTPUT_H2)
+                                    , (self.HEATMAP_H2, "h2", self.OUTPUT_H2)
+                                    , (self.HEATMAP_W3H2, "w3h2", self.OUTPUT_W3H2)
+                                    , (self.HEATMAP_O, "o", self.OUTPUT_O)
+                                    , (self.HEATMAP_W3, "w3", initial["w3"])
+                                    , (self.HEATMAP_B3, "b3", initial["b3"])]:
+            playback.add_heatmap(heatmap, snapshots(key, start))
+
+        # Receptive fields (one image per row of w1)
+        if self.RECEPTIVE_FIELDS is not None:
+            w1_snapshots = snapshots("w1", initial["w1"])
+            rows = int(np.sqrt(w1_snapshots.shape[2]))
+            for i, field in enumerate(self.RECEPTIVE_FIELDS[1]):
+                playback.add_pixel_image(field, w1_snapshots[:, i].reshape(-1, rows, rows))
+
+        # Predictions
+        for i, prediction_text_group in enumerate(self.PREDICTIONS_OBJECTS):
+            playback.add_label(prediction_text_group[1]
+                               , ["..."] + [state["predictions"][i] for state in states])
+
+        # Status counters
+        validation = not np.isnan(states[-1]["validation_accuracy"])
+        status, labels = create_status_counters(validation, self.HEADER_FONT_SIZE, -6.15, -3.5)
+        playback.add_label(labels[0], list(range(len(states) + 1)))
+        playback.add_label(labels[1], [0.0] + [float(state["accuracy"]) for state in states]
+                           , interpolate=True)
+        if validation:
+            playback.add_label(labels[2], [0.0] + [float(state["validation_accuracy"]) for state in states]
+                               , interpolate=True)
+        self.add(status)
+
+        playback.play(self, self.epoch_run_time(len(playback.mobjects)) * len(states))
+
+    # Seconds one epoch's animation lasts: EPOCH_RUN_TIME, or (when None) one
+    # ANIMATION_RUN_TIME for each of the epoch's `updates` played one after
+    # another
+    def epoch_run_time(self, updates):
+        if self.EPOCH_RUN_TIME is not None:
+            return self.EPOCH_RUN_TIME
+        return updates * self.ANIMATION_RUN_TIME
+
+    # Settings that change how the network trains (or which data points are
+    # recorded), so a checkpoint is only resumed with the settings it was
+    # saved with
+    def checkpoint_settings(self):
+        return {"batch_size": self.BATCH_SIZE
+                , "dtype": np.dtype(self.DTYPE).name
+                , "optimizer": self.OPTIMIZER
+                , "learning_rate": optimizer_learning_rate(self.OPTIMIZER
+                                                           , self.LEARNING_RATE)
+                , "training_data_points": list(self.TRAINING_DATA_POINTS)
+                , "validation_fraction": self.VALIDATION_FRACTION}
+
+    # Train the network, yielding the recorded state after each epoch
+    def train_network(self, train, label, Y, w1, b1, w2, b2, w3, b3, trace
+                      , optimizer_state, validation, validation_label):
+        # Create the optimizer, restoring its state (e.g. Adam's running
+        # averages) when resuming
+        optimizer = create_optimizer(self.OPTIMIZER, [w1, b1, w2, b2, w3, b3]
+                                     , self.LEARNING_RATE)
+        if optimizer_state:
+            optimizer.set_state(optimizer_state)
+
+        # Set other params (carrying on from any epochs already recorded)
+        accuracies = [float(accuracy) for accuracy in trace.epochs["accuracy"]]
+        epoch = len(accuracies)
+        previous_accuracy = 100
+        accuracy = 0
+        if epoch > 0:
+            previous_accuracy = accuracies[-2] if epoch > 1 else 0
+            accuracy = accuracies[-1]
+
+        # Images used for training (accuracy is always computed on the
+        # dense images)
+        training_images = to_sparse(train) if self.SPARSE_INPUT else train
+
+        # Tracked training data points, snapshotted after every epoch
+        tracked_images = train[self.TRAINING_DATA_POINTS]
+
+        # Replay epochs completed before the run was interrupted
+        for state in trace:
+            yield state
+
         # While:
         #  1. Accuracy is improving by 1% or more per epoch, and
         #  2. There are 20 epochs or less
@@ -305,119 +446,90 @@ class VisualiseNeuralNetwork(Scene):
             # record previous accuracy
             previous_accuracy = accuracy
 
-            # Iterate through training data
-            for index in range(train.shape[0]):
-                # Select a single image and associated y vector
-                X = train[index:index + 1, :].T
-                y = Y[index:index + 1].T
-
-                # 1. Forward pass: compute Output/Prediction (o)
-                h1 = calculate_layer_output(w1, X, b1, activation_type="relu")
-                h2 = calculate_layer_output(w2, h1, b2, activation_type="relu")
-                o = calculate_layer_output(w3, h2, b3, activation_type="softmax")
-
-                # 2. Compute Loss Vector
-                L = np.square(o - y)
-
-                # 3. Backpropagation
-                # Compute Loss derivative w.r.t. Output/Prediction vector (o)
-                dL_do = 2.0 * (o - y)
-
-                # Compute Output Layer derivatives
-                dL3_dw3, dL3_dh2, dL3_db3 = layer_backprop(dL_do, o, h2, w3
-                                                           , "softmax")
-                # Compute Hidden Layer 2 derivatives
-                dL2_dw2, dL2_dh2, dL2_db2 = layer_backprop(dL3_dh2, h2, h1, w2
-                                                           , "relu")
-                # Compute Hidden Layer 1 derivatives
-                dL1_dw1, _, dL1_db1 = layer_backprop(dL2_dh2, h1, X, w1
-                                                     , "relu")
-
-                # 4. Update weights & biases
-                w1, b1 = gradient_descent(w1, b1, dL1_dw1, dL1_db1, learning_rate)
-                w2, b2 = gradient_descent(w2, b2, dL2_dw2, dL2_db2, learning_rate)
-                w3, b3 = gradient_descent(w3, b3, dL3_dw3, dL3_db3, learning_rate)
-
-                # Decide whether to animate
-                animate = True if index in self.TRAINING_DATA_POINTS else False
+            # Train for one epoch
+            train_epoch(training_images, Y, w1, b1, w2, b2, w3, b3
+                        , optimizer.learning_rate
+                        , batch_size=self.BATCH_SIZE
+                        , optimizer=optimizer)
 
-                # Set animation parameters
-                if animate:
-                    # print(h1[:, 0].shape)
-                    # print(self.OUTPUT_H1[:, i].shape)
-
-                    i = self.TRAINING_DATA_POINTS.index(index)
-                    self.OUTPUT_PREDICTIONS[i] = get_prediction(o)
-                    self.OUTPUT_H1[:, i] = h1[:, 0]
-                    self.OUTPUT_W2H1[:, i] = (w2 @ h1)[:, 0]
-                    self.OUTPUT_H2[:, i] = h2[:, 0]
-                    self.OUTPUT_W3H2[:, i] = (w3 @ h2)[:, 0]
-                    self.OUTPUT_O[:, i] = o[:, 0]
-
-            # Animate Changes
-            # Hidden Layer 2
-            self.animate_heatmap(self.HEATMAP_W2, self.W2_PLACEMENT[0], self.W2_PLACEMENT[1], w2,
-                                                  self.HEATMAP_SQUARE_SCALE, "w2")
-            self.animate_heatmap(self.HEATMAP_B2, self.B2_PLACEMENT[0], self.B2_PLACEMENT[1], b2,
-                                                  self.HEATMAP_SQUARE_SCALE, "b2")
-            self.animate_heatmap(self.HEATMAP_H1, self.H1_PLACEMENT[0], self.H1_PLACEMENT[1],
-                                                  self.OUTPUT_H1, self.HEATMAP_SQUARE_SCALE, "h1")
-            self.animate_heatmap(self.HEATMAP_W2H1, self.W2H1_PLACEMENT[0], self.W2H1_PLACEMENT[1],
-                                                    self.OUTPUT_W2H1, self.HEATMAP_SQUARE_SCALE, "w2@h1")
-            self.animate_heatmap(self.HEATMAP_H2_2, self.H2_2_PLACEMENT[0], self.H2_2_PLACEMENT[1],
-                                                    self.OUTPUT_H2, self.HEATMAP_SQUARE_SCALE, "h2")
-
-            # Output Layer
-            self.animate_heatmap(self.HEATMAP_H2, self.H2_PLACEMENT[0], self.H2_PLACEMENT[1],
-                                                  self.OUTPUT_H2, self.HEATMAP_SQUARE_SCALE, "h2")
-            self.animate_heatmap(self.HEATMAP_W3H2, self.W3H2_PLACEMENT[0], self.W3H2_PLACEMENT[1],
-                                                    self.OUTPUT_W3H2, self.HEATMAP_SQUARE_SCALE, "w3@h2")
-            self.animate_heatmap(self.HEATMAP_O, self.O_PLACEMENT[0], self.O_PLACEMENT[1], self.OUTPUT_O,
-                                                 self.HEATMAP_SQUARE_SCALE, "o")
-            self.animate_heatmap(self.HEATMAP_W3, self.W3_PLACEMENT[0], self.W3_PLACEMENT[1], w3,
-                                                  self.HEATMAP_SQUARE_SCALE, "w3")
-            self.animate_heatmap(self.HEATMAP_B3, self.B3_PLACEMENT[0], self.B3_PLACEMENT[1], b3,
-                                                  self.HEATMAP_SQUARE_SCALE, "b3")
-
-            for i in range(len(self.OUTPUT_PREDICTIONS)):
-                self.animate_prediction_text("Prediction", self.PREDICTIONS_OBJECTS[i], self.OUTPUT_PREDICTIONS[i],
-                                             self.PREDICTIONS_X_PLACEMENT[i], self.PREDICTIONS_Y_PLACEMENT[i])
-
-            # Compute & print Accuracy (%)
-            accuracy = compute_accuracy(train, label, w1, b1, w2, b2, w3, b3)
-            print(f'Accuracy: {accuracy:.2f} %')
+            # Snapshot the tracked data points' outputs with the trained
+            # weights, in one forward pass
+            tracked = snapshot_activations(tracked_images, w1, b1, w2, b2, w3, b3)
+
+            # Compute & print Accuracy (%) and mean loss
+            accuracy, _, loss = evaluate(train, label, w1, b1, w2, b2, w3, b3)
+            print(f'Accuracy: {accuracy:.2f} %, Loss: {loss:.4f}')
+
+            # Compute & print validation Accuracy (%) on the held out images
+            validation_accuracy = np.nan
+            if len(validation_label) > 0:
+                validation_accuracy, _, validation_loss = evaluate(
+                    validation, validation_label, w1, b1, w2, b2, w3, b3)
+                print(f'Validation Accuracy: {validation_accuracy:.2f} %, '
+                      f'Loss: {validation_loss:.4f}')
 
             # Increment epoch
             epoch += 1
-            self.animate_text(status_text, f'Epoch: {epoch}\nAccuracy: {accuracy:.2f}%', self.HEADER_FONT_SIZE, -6.15, -3.65)
 
-        self.wait(3)
+            trace.record(w1=w1, w2=w2, b2=b2, w3=w3, b3=b3
+                         , h1=tracked["h1"], w2h1=tracked["w2h1"]
+                         , h2=tracked["h2"], w3h2=tracked["w3h2"]
+                         , o=tracked["o"]
+                         , predictions=tracked["predictions"]
+                         , accuracy=accuracy
+                         , validation_accuracy=validation_accuracy)
+            accuracies += [accuracy]
+
+            # Save the recorded training run (so later renders can replay it)
+            # and a checkpoint to resume from
+            trace.save(self.TRACE_FILE)
+            save_checkpoint(self.CHECKPOINT_FILE, [w1, b1, w2, b2, w3, b3]
+                            , epoch, accuracies, self.checkpoint_settings()
+                            , **optimizer.get_state())
+
+            yield trace[-1]
+
+        # Training finished, so there is nothing left to resume
+        if os.path.exists(self.CHECKPOINT_FILE):
+            os.remove(self.CHECKPOINT_FILE)
 
     # Create Methods
     def create_input_image(self, training_image, left_shift, down_shift):
         # Initialise params
-        square_count = training_image.shape[0]
-        rows = np.sqrt(square_count)
+        rows = int(np.sqrt(training_image.shape[0]))
 
-        # Create list of squares to represent pixels
-        squares = [
-            Square(fill_color=WHITE
-                   , fill_opacity=training_image[i]
-                   , stroke_width=0.2).scale(0.01)
-            for i in range(square_count)
-        ]
-
-        # Place all the squares into a VGroup and arrange into a 28x28 grid
-        group = VGroup(*squares).arrange_in_grid(rows=int(rows), buff=0)
+        # Show the pixels as a single 28x28 image with grid lines
+        image = PixelImage(training_image.reshape(rows, rows), 0.02
+                           , grid_width=0.2)
 
         # Shift into correct position in the scene
-        group.shift(left_shift * LEFT).shift(down_shift * DOWN)
+        image.shift(left_shift * LEFT).shift(down_shift * DOWN)
+
+        return image
 
-        return group
+    # Each hidden layer 1 node's weights (rows of w1) as 28x28 images in two
+    # rows of five, with a header. Pixels are green for positive & red for
+    # negative weights, with opacity relative to the node's largest weight.
+    # Returns Group(header, Group(images)).
+    def create_receptive_fields(self, w1, left_shift, down_shift):
+        rows = int(np.sqrt(w1.shape[1]))
+        fields = Group(*[
+            PixelImage(weights.reshape(rows, rows), self.RECEPTIVE_FIELD_PIXEL_SIZE
+                       , colormap=lambda values: heatmap_image_colors(values, self.HEATMAP_PALETTE))
+            for weights in w1
+        ]).arrange_in_grid(rows=2, buff=0.08)
+
+        header = cached_text("w1", font_size=self.HEADER_2_FONT_SIZE)
+        header.next_to(fields, 0.5 * UP)
+
+        receptive_fields = Group(header, fields)
+        receptive_fields.shift(left_shift * LEFT).shift(down_shift * DOWN)
+
+        return receptive_fields
 
     def create_text(self, text, font_size, left_shift, down_shift):
         # Create text
-        text = Text(text, font_size=font_size)
+        text = cached_text(text, font_size=font_size)
 
         # Position text
         text.shift(left_shift * LEFT)
@@ -430,7 +542,7 @@ class VisualiseNeuralNetwork(Scene):
         prediction_text_group = VGroup()
 
         # Create & position text
-        prediction_text = Text(f'{prediction}', font_size=40)
+        prediction_text = NumberLabel(prediction, '{}', font_size=40)
         prediction_text.shift(left_shift * LEFT).shift(down_shift * DOWN)
 
         # Create text box (helps with positioning Prediction Header)
@@ -440,8 +552,8 @@ class VisualiseNeuralNetwork(Scene):
         prediction_text_box.move_to(prediction_text)
 
         # Create Header Text
-        prediction_header = Text(header_text
-                                 , font_size=self.HEADER_2_FONT_SIZE)
+        prediction_header = cached_text(header_text
+                                        , font_size=self.HEADER_2_FONT_SIZE)
         prediction_header.next_to(prediction_text_box, UP)
 
         # Group items
@@ -452,68 +564,45 @@ class VisualiseNeuralNetwork(Scene):
         return prediction_text_group
 
     def create_heatmap(self, left_shift, down_shift, array, scale, text, text_shift=UP):
-        # Initialise params
-        rows, cols = array.shape
-        square_count = rows * cols
-        norm_array = array.copy() if np.max(array) == 0 else array.copy() / np.max(np.absolute(array))
-        group = VGroup()
-        text = self.create_text(text
-                                , self.HEADER_2_FONT_SIZE
-                                , 0
-                                , 0)
-
-        # Create list of squares to represent pixels
-        squares = [
-            Square(fill_color=GREEN if norm_array.flatten()[i] >= 0 else RED
-                   , fill_opacity=abs(norm_array.flatten()[i])
-                   , stroke_width=0.3).scale(scale)
-            for i in range(square_count)
-        ]
-
-        # Place all the squares into a VGroup and arrange into a 28x28 grid
-        for square in squares:
-            group.add(square)
-        group.arrange_in_grid(rows=int(rows), buff=0)
+        # Create heatmap (squares & label)
+        heatmap = Heatmap(array, scale, text, self.HEADER_2_FONT_SIZE, text_shift
+                          , self.HEATMAP_PALETTE)
 
         # Shift into correct position in the scene
-        group.shift(left_shift * LEFT).shift(down_shift * DOWN)
-
-        # Add text
-        text.next_to(group, text_shift)
-        group.add(text)
+        heatmap.shift(left_shift * LEFT).shift(down_shift * DOWN)
 
-        return group
+        return heatmap
 
     # Animate Methods
-    def animate_input_image(self, input_image, X, left_shift, down_shift):
-        # 1. Create input image with new parameters
-        new_input_image = self.create_input_image(X, left_shift, down_shift)
-        # 2. Transform old input image to new image
-        self.play(Transform(input_image, new_input_image)
+    def animate_input_image(self, input_image, X):
+        # Cross-fade the input image to the new pixels
+        rows = int(np.sqrt(X.shape[0]))
+        self.play(UpdatePixelImage(input_image, X.reshape(rows, rows))
                   , run_time=self.ANIMATION_RUN_TIME)
 
-    def animate_text(self, text, new_string, font_size, left_shift, down_shift):
-        # 1. Create text with new parameters
-        new_text = self.create_text(new_string
-                                    , font_size
-                                    , left_shift
-                                    , down_shift)
-        # 2. Transform old text to new text
-        self.play(Transform(text, new_text)
-                  , run_time=self.ANIMATION_RUN_TIME)
-
-    def animate_prediction_text(self, header_text, prediction_text_group, prediction, left_shift, down_shift):
-        # 1. Create prediction text with new parameters
-        new_prediction_text_group = self.create_prediction_text(header_text, prediction
-                                                                , left_shift, down_shift)
-        # 2. Transform old prediction text to new prediction text
-        self.play(Transform(prediction_text_group, new_prediction_text_group)
-                  , run_time=self.ANIMATION_RUN_TIME)
-        # self.play(Circumscribe(prediction_text, Circle))
-
-    def animate_heatmap(self, heatmap, left_shift, down_shift, array, scale, text, text_shift=UP):
-        # 1. Create heatmap with new parameters
-        new_heatmap = self.create_heatmap(left_shift, down_shift, array, scale, text, text_shift)
-        # 2. Transform old heatmap to new heatmap
-        self.play(Transform(heatmap, new_heatmap)
-                  , run_time=self.ANIMATION_RUN_TIME)
+    # Update the status counters after an epoch, counting the accuracies up
+    # (or down) to their new values (validation accuracy is NaN when
+    # validation is skipped)
+    def animate_status(self, status_labels, epoch, accuracy, validation_accuracy, batch=None):
+        values = [epoch, float(accuracy), float(validation_accuracy)]
+        for label, value, interpolate in zip(status_labels, values, [False, True, True]):
+            if not np.isnan(value):
+                play_or_add(self, ChangeNumber(label, value, interpolate)
+                            , self.ANIMATION_RUN_TIME, batch)
+
+    def animate_prediction_text(self, prediction_text_group, prediction, batch=None):
+        # Switch the prediction's glyphs to the new digit
+        play_or_add(self, ChangeNumber(prediction_text_group[1], prediction, interpolate=False)
+                    , self.ANIMATION_RUN_TIME, batch)
+
+    def animate_receptive_fields(self, receptive_fields, w1, batch=None):
+        # Cross-fade each node's image to its new weights
+        rows = int(np.sqrt(w1.shape[1]))
+        for field, weights in zip(receptive_fields[1], w1):
+            play_or_add(self, UpdatePixelImage(field, weights.reshape(rows, rows))
+                        , self.ANIMATION_RUN_TIME, batch)
+
+    def animate_heatmap(self, heatmap, array, batch=None):
+        # Fade the heatmap's colours to the new values
+        play_or_add(self, UpdateHeatmap(heatmap, array, self.HEATMAP_CHANGE_THRESHOLD)
+                    , self.ANIMATION_RUN_TIME, batch)
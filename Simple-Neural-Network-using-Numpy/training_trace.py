@@ -0,0 +1,77 @@
+# Relevant imports
+import numpy as np
+
+from checkpoint import save_npz
+
+# Arrays recorded at the end of every epoch
+EPOCH_KEYS = ["w1", "w2", "b2", "w3", "b3"
+              , "h1", "w2h1", "h2", "w3h2", "o"
+              , "predictions", "accuracy", "validation_accuracy"]
+
+
+# Arrays stored as integers / full precision, everything else is float32
+EXACT_KEYS = ["predictions", "accuracy", "validation_accuracy"]
+
+
+# Records the state of the network after every epoch so that a scene can be
+# re-rendered (replayed) without retraining the network.
+# Arrays are stored as float32 as soon as they're recorded, so a scene
+# animating a live training run sees exactly the same values as a replay
+# (which keeps Manim's cached partial movies valid between the two).
+class TrainingTrace:
+
+    def __init__(self, images, w1, w2, b2, w3, b3):
+        # Tracked input images, one per row
+        self.images = np.array(images, dtype=np.float32)
+        # Weights & biases before training starts
+        self.initial = {"w1": np.array(w1, dtype=np.float32)
+                        , "w2": np.array(w2, dtype=np.float32)
+                        , "b2": np.array(b2, dtype=np.float32)
+                        , "w3": np.array(w3, dtype=np.float32)
+                        , "b3": np.array(b3, dtype=np.float32)}
+        # One list of snapshots per recorded array
+        self.epochs = {key: [] for key in EPOCH_KEYS}
+
+    def __len__(self):
+        return len(self.epochs["accuracy"])
+
+    def __getitem__(self, epoch):
+        return {key: self.epochs[key][epoch] for key in EPOCH_KEYS}
+
+    def __iter__(self):
+        for epoch in range(len(self)):
+            yield self[epoch]
+
+    def record(self, **snapshot):
+        # Copy each array so later in-place training updates don't change it
+        for key in EPOCH_KEYS:
+            if key in EXACT_KEYS:
+                self.epochs[key] += [np.array(snapshot[key], copy=True)]
+            else:
+                self.epochs[key] += [np.array(snapshot[key], dtype=np.float32)]
+
+    # Drop any epochs after the first `epochs` epochs
+    def truncate(self, epochs):
+        for key in EPOCH_KEYS:
+            self.epochs[key] = self.epochs[key][:epochs]
+
+    def save(self, path):
+        arrays = {"images": self.images}
+        for key, value in self.initial.items():
+            arrays[f'initial_{key}'] = value
+
+        # Stack each recorded array along a new leading (epoch) axis
+        for key in EPOCH_KEYS:
+            arrays[key] = np.array(self.epochs[key])
+
+        save_npz(path, **arrays)
+
+
+def load_trace(path):
+    with np.load(path) as data:
+        trace = TrainingTrace(data["images"], data["initial_w1"]
+                              , data["initial_w2"], data["initial_b2"]
+                              , data["initial_w3"], data["initial_b3"])
+        for key in EPOCH_KEYS:
+            trace.epochs[key] = list(data[key])
+    return trace
@@ -0,0 +1,134 @@
+# Relevant imports
+from manim import *
+import numpy as np
+
+from text_cache import cached_text
+from value_animation import ValueAnimation
+
+# Characters a NumberLabel can show: those of numbers in the usual formats
+# (including "nan", "inf" & exponents like "1e+20"), percentages & "..."
+GLYPH_CHARACTERS = "0123456789.-+,%eainf"
+
+# Gap between glyphs, as a fraction of the font size's glyph height
+GLYPH_SPACING = 0.15
+
+# Glyph outlines per font size, rendered once (see glyph_set)
+_glyph_sets = {}
+
+
+# Outline points & width of each character in GLYPH_CHARACTERS at a font size.
+# The characters are rendered through Pango once, in a single Text (without
+# ligatures, so there is one glyph per character), so they share a baseline;
+# each glyph's points are stored with its left edge at x = 0.
+# Returns a dictionary: character -> (points, width), plus the gap to leave
+# between glyphs.
+def glyph_set(font_size):
+    if font_size not in _glyph_sets:
+        text = Text(GLYPH_CHARACTERS, font_size=font_size, disable_ligatures=True)
+        glyphs = {}
+        for character, glyph in zip(GLYPH_CHARACTERS, text.submobjects):
+            points = glyph.points - np.array([glyph.get_left()[0], 0, 0])
+            glyphs[character] = (points, glyph.width)
+        _glyph_sets[font_size] = (glyphs, GLYPH_SPACING * text.height)
+    return _glyph_sets[font_size]
+
+
+# A number drawn from pre-rendered glyph outlines.
+# The label owns a fixed set of glyph mobjects ("slots"); set_value copies the
+# outline points of each character into a slot, so changing the number never
+# renders text or creates mobjects (unless it needs more characters than there
+# are slots). The label stays where it was placed: centred, or with the edge
+# given by aligned_edge (e.g. LEFT) fixed.
+class NumberLabel(VGroup):
+
+    def __init__(self, value, number_format='{:.1f}', font_size=12
+                 , slots=6, color=WHITE, aligned_edge=ORIGIN):
+        self.number_format = number_format
+        self.aligned_edge = aligned_edge
+        self.glyphs, self.spacing = glyph_set(font_size)
+        self.slots = [self.create_slot(color) for _ in range(slots)]
+        super().__init__(*self.slots)
+        self.value = None
+        self.set_value(value)
+
+    @staticmethod
+    def create_slot(color):
+        return VMobject(fill_color=color, fill_opacity=1, stroke_width=0)
+
+    def set_value(self, value):
+        string = self.number_format.format(value)
+        if self.value is not None and string == self.number_format.format(self.value):
+            self.value = value
+            return self
+        for character in string:
+            if character not in self.glyphs:
+                raise ValueError(f'NumberLabel can\'t show "{string}": '
+                                 f'"{character}" is not one of "{GLYPH_CHARACTERS}"')
+        anchor = (self.get_critical_point(self.aligned_edge)
+                  if self.value is not None else ORIGIN)
+
+        # Add slots if the number has grown past the ones available
+        color = self.slots[0].get_fill_color()
+        while len(self.slots) < len(string):
+            self.slots += [self.create_slot(color)]
+            self.add(self.slots[-1])
+
+        # Lay the glyphs out left to right
+        x = 0
+        for slot, character in zip(self.slots, string):
+            points, width = self.glyphs[character]
+            slot.points = points + np.array([x, 0, 0])
+            x += width + self.spacing
+        for slot in self.slots[len(string):]:
+            slot.points = np.zeros((0, 3))
+
+        self.value = value
+        self.move_to(anchor, aligned_edge=self.aligned_edge)
+        return self
+
+    def get_value(self):
+        return self.value
+
+
+# Changes a NumberLabel to a new value, either counting smoothly from its
+# current value or (interpolate=False, e.g. for labels & non-numeric values
+# like "...") switching to the new value halfway through
+class ChangeNumber(ValueAnimation):
+
+    def __init__(self, label, value, interpolate=True, **kwargs):
+        self.interpolate = interpolate
+        super().__init__(label, value, **kwargs)
+
+    def get_values(self):
+        return self.mobject.get_value()
+
+    def set_values(self, value):
+        self.mobject.set_value(value)
+
+    def interpolate_values(self, progress):
+        if self.interpolate:
+            return super().interpolate_values(progress)
+        return self.target_values if progress >= 0.5 else self.start_values
+
+
+# Status counters (epoch, accuracy & optionally validation accuracy), one row
+# each, drawn with NumberLabels so they can change without new text (the
+# headers come from the text cache).
+# Returns the rows (to add to the scene) & the counters' labels.
+def create_status_counters(validation, font_size=20, left_shift=0, down_shift=0):
+    rows = VGroup()
+    labels = []
+    counters = [("Epoch:", '{:d}'), ("Accuracy:", '{:.2f}%')]
+    if validation:
+        counters += [("Validation:", '{:.2f}%')]
+    for header, number_format in counters:
+        label = NumberLabel(0, number_format, font_size, aligned_edge=LEFT)
+        rows.add(VGroup(cached_text(header, font_size=font_size), label)
+                 .arrange(RIGHT, buff=0.1))
+        labels += [label]
+
+    # Arrange & position rows
+    rows.arrange(DOWN, aligned_edge=LEFT, buff=0.1)
+    rows.shift(left_shift * LEFT).shift(down_shift * DOWN)
+
+    return rows, labels
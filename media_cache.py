@@ -0,0 +1,263 @@
+# Relevant imports
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from manim import *
+from manimpango import PangoUtils
+from manim.utils.tex_file_writing import make_tex_compilation_command, tex_hash
+
+# Text & LaTeX SVGs rendered for every course are cached here
+SHARED_MEDIA_DIR = Path(__file__).resolve().parent / "media"
+
+# Command line option that turns on batch LaTeX compilation (see
+# compile_tex_batch). It's off by default: the page SVGs haven't yet been
+# compared with tex_to_svg_file's output for the same expressions on a real TeX
+# install, and a page cropped or offset differently would stay in the shared
+# cache for every course.
+BATCH_TEX_OPTION = "--batch-tex"
+
+
+# One cache of the SVGs Manim renders for Text / MarkupText & Tex / MathTex,
+# shared by every course folder.
+# Manim names each cached SVG after a hash of its content (the text & its
+# style, or the LaTeX document), so a single directory can serve every course:
+# a string rendered for one course is reused by all the others.
+#
+# Several renders may use the cache at once, so use_shared_media_cache() also
+# makes writing to it atomic: each SVG is finished in a private build
+# directory & moved into place with os.replace, so no render ever reads a
+# half-written SVG, and LaTeX's intermediate files (& Manim's clean-up of
+# them) stay out of the shared directory. Cached SVGs are never rewritten in
+# place. Only renders that call use_shared_media_cache() may use the shared
+# directory, so it isn't set in the courses' manim.cfg files (plain `manim`
+# keeps each course's own cache in its media folder).
+# Renders can be started through this module to use it, e.g.
+#   cd "Bias and Perceptrons"
+#   python ../media_cache.py -ql 0.py TitleScene
+def use_shared_media_cache(media_dir=SHARED_MEDIA_DIR):
+    config.text_dir = str(Path(media_dir) / "texts")
+    config.tex_dir = str(Path(media_dir) / "Tex")
+
+    # Wrap Manim's SVG writers (once)
+    if not getattr(Text._text2svg, "atomic", False):
+        Text._text2svg = atomic_text2svg(Text._text2svg)
+        MarkupText._text2svg = atomic_text2svg(MarkupText._text2svg)
+        sys.modules[Text.__module__].PangoUtils = CachedPangoUtils
+        tex_module = sys.modules[SingleStringMathTex.__module__]
+        tex_module.tex_to_svg_file = atomic_tex_to_svg_file(tex_module.tex_to_svg_file)
+
+
+# The LaTeX document Manim compiles for an expression, which is what its cached
+# SVG is named after
+def tex_code(expression, environment=None, tex_template=None):
+    if tex_template is None:
+        tex_template = config["tex_template"]
+    if environment is not None:
+        return tex_template.get_texcode_for_expression_in_env(expression, environment)
+    return tex_template.get_texcode_for_expression(expression)
+
+
+# Point one of Manim's cache directories (config key "text_dir" or "tex_dir")
+# at a new private directory inside it until the block ends, then delete it.
+# Yields the build directory.
+@contextmanager
+def build_directory(key):
+    shared = config.get_dir(key)
+    shared.mkdir(parents=True, exist_ok=True)
+    build = Path(tempfile.mkdtemp(prefix=".build-", dir=shared))
+    config[key] = str(build)
+    try:
+        yield build
+    finally:
+        config[key] = str(shared)
+        shutil.rmtree(build, ignore_errors=True)
+
+
+# Wrap Text._text2svg (or MarkupText._text2svg) so it renders into a build
+# directory & moves the finished SVG into the cache. Pango's trailing move
+# command, which Text & MarkupText strip from the SVG, is stripped before the
+# SVG is moved in (see CachedPangoUtils).
+def atomic_text2svg(text2svg):
+    def _text2svg(self, color):
+        svg_file = config.get_dir("text_dir") / (self._text2hash(color) + ".svg")
+        if not svg_file.exists():
+            with build_directory("text_dir"):
+                built = text2svg(self, color)
+                PangoUtils.remove_last_M(built)
+                os.replace(built, svg_file)
+        return str(svg_file.resolve())
+
+    _text2svg.atomic = True
+    return _text2svg
+
+
+# Text & MarkupText strip Pango's trailing move command from their SVG by
+# rewriting the file, every time one is created. Rewriting a cached SVG in
+# place would let another render read it truncated, so remove_last_M leaves
+# the files in the cache alone (atomic_text2svg stripped them already).
+class CachedPangoUtils(PangoUtils):
+
+    @staticmethod
+    def remove_last_M(file_path):
+        if Path(file_path).resolve().parent != config.get_dir("text_dir").resolve():
+            PangoUtils.remove_last_M(file_path)
+
+
+# Wrap tex_to_svg_file so LaTeX runs in a build directory & only the finished
+# .tex & .svg files are moved into the cache (the .svg last, as its presence
+# marks the expression as compiled)
+def atomic_tex_to_svg_file(tex_to_svg_file):
+    def _tex_to_svg_file(expression, environment=None, tex_template=None):
+        svg_file = config.get_dir("tex_dir") / (
+            tex_hash(tex_code(expression, environment, tex_template)) + ".svg")
+        if not svg_file.exists():
+            with build_directory("tex_dir"):
+                built = tex_to_svg_file(expression, environment, tex_template)
+                os.replace(built.with_suffix(".tex"), svg_file.with_suffix(".tex"))
+                os.replace(built, svg_file)
+        return svg_file
+
+    return _tex_to_svg_file
+
+
+# Raised to stop a Tex / MathTex being built once its LaTeX is known
+class TexCollected(Exception):
+    pass
+
+
+# The (expression, environment, tex_template) LaTeX is run on to build a Tex /
+# MathTex, found by calling make_mobject (e.g. lambda: MathTex("w_1 = 0.5"))
+# with the compilation intercepted. Returns None if nothing is compiled.
+def collect_tex(make_mobject):
+    collected = []
+
+    def record(expression, environment=None, tex_template=None):
+        collected.append((expression, environment, tex_template))
+        raise TexCollected
+
+    tex_module = sys.modules[SingleStringMathTex.__module__]
+    tex_to_svg_file = tex_module.tex_to_svg_file
+    tex_module.tex_to_svg_file = record
+    try:
+        make_mobject()
+    except TexCollected:
+        pass
+    finally:
+        tex_module.tex_to_svg_file = tex_to_svg_file
+    return collected[0] if collected else None
+
+
+# Compile many Tex / MathTex expressions with one LaTeX & one dvisvgm run.
+# Every expression (expression, environment, tex_template) that isn't cached
+# yet becomes one page of a single standalone document (one per template);
+# the pages are then converted to SVGs in one go & moved into the cache under
+# the names Manim would have given them, so building the mobjects later only
+# reads the cache. Expressions whose template isn't a standalone document are
+# left for Manim to compile.
+# Returns the number of expressions compiled.
+def compile_tex_batch(expressions):
+    tex_dir = config.get_dir("tex_dir")
+
+    # Group the pages by template (preamble, compiler & output format)
+    documents = {}
+    for expression, environment, tex_template in expressions:
+        if tex_template is None:
+            tex_template = config["tex_template"]
+        code = tex_code(expression, environment, tex_template)
+        svg_file = tex_dir / (tex_hash(code) + ".svg")
+        if svg_file.exists() or "{standalone}" not in tex_template.documentclass:
+            continue
+        preamble, body = code.split(r"\begin{document}", 1)
+        page = body.rsplit(r"\end{document}", 1)[0]
+        key = (preamble, str(tex_template.tex_compiler), tex_template.output_format)
+        documents.setdefault(key, (tex_template, {}))[1].setdefault(svg_file, (code, page))
+
+    compiled = 0
+    for (preamble, _, _), (tex_template, pages) in documents.items():
+        compiled += compile_pages(preamble, tex_template, pages)
+    return compiled
+
+
+# Run a command, returning its exit code (-1 if it isn't installed)
+def run(command):
+    try:
+        return subprocess.run(command, stdout=subprocess.DEVNULL).returncode
+    except OSError:
+        return -1
+
+
+# Compile one document with a page per expression & split it into the cache.
+# pages: svg file -> (expression's own .tex code, page content)
+def compile_pages(preamble, tex_template, pages):
+    output_format = tex_template.output_format
+    compilers = tex_template.tex_compiler
+    compilers = [compilers] if isinstance(compilers, str) else compilers
+
+    with build_directory("tex_dir") as build:
+        # standalone's multi mode crops each "manimpage" environment to a page
+        # of its own (without it the whole body would be one cropped page)
+        preamble = re.sub(r"\\documentclass(?:\[(.*?)\])?\{standalone\}"
+                          , lambda match: (r"\documentclass["
+                                           + (match[1] + "," if match[1] else "")
+                                           + r"multi=manimpage]{standalone}")
+                          , preamble, count=1)
+        tex_file = build / "batch.tex"
+        tex_file.write_text(preamble
+                            + "\\newenvironment{manimpage}{}{}\n"
+                            + "\\begin{document}\n"
+                            + "".join(f'\\begin{{manimpage}}{page}\\end{{manimpage}}\n'
+                                      for _, page in pages.values())
+                            + "\\end{document}\n", encoding="utf-8")
+        for compiler in compilers:
+            command = make_tex_compilation_command(compiler, output_format, tex_file, build)
+            if run(command) != 0:
+                # Leave the expressions for Manim, which reports LaTeX errors
+                # for each expression on its own
+                logger.warning(f'Batch LaTeX compilation with {compiler} failed, '
+                               f'compiling {len(pages)} expressions one at a time')
+                return 0
+
+        # Convert every page (page-<number>.svg)
+        run(["dvisvgm"
+             , *(["--pdf"] if output_format == ".pdf" else [])
+             , "--page=1-"
+             , "--no-fonts"
+             , "--verbosity=0"
+             , f'--output={(build / "page-%p.svg").as_posix()}'
+             , tex_file.with_suffix(output_format).as_posix()])
+        page_files = {int(page_file.stem.split("-")[1]): page_file
+                      for page_file in build.glob("page-*.svg")}
+        if len(page_files) != len(pages):
+            logger.warning(f'Batch LaTeX compilation produced {len(page_files)} pages '
+                           f'for {len(pages)} expressions, '
+                           f'compiling them one at a time')
+            return 0
+
+        # Move each page into the cache (the .svg last, as its presence marks
+        # the expression as compiled)
+        for number, (svg_file, (code, _)) in enumerate(pages.items(), start=1):
+            svg_file.with_suffix(".tex").write_text(code, encoding="utf-8")
+            os.replace(page_files[number], svg_file)
+    return len(pages)
+
+
+# Render with the manim command line, using the shared cache:
+#   python media_cache.py [--batch-tex] [manim render arguments]
+# With --batch-tex, the LaTeX of the scene file's Tex / MathTex calls is
+# compiled in one batch first (see compile_tex_batch & prewarm_text_cache.py).
+if __name__ == '__main__':
+    from manim.__main__ import main
+    from prewarm_text_cache import prewarm_tex
+
+    use_shared_media_cache()
+    if BATCH_TEX_OPTION in sys.argv:
+        sys.argv.remove(BATCH_TEX_OPTION)
+        prewarm_tex([argument for argument in sys.argv[1:] if argument.endswith(".py")])
+    sys.argv[0] = "manim"
+    main()
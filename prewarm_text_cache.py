@@ -0,0 +1,146 @@
+# Renders the Text / MathTex / Tex mobjects used by the scenes into the shared
+# text & LaTeX cache (see media_cache.py) before any scene runs, several at a
+# time, so rendering a scene is spent on its frames rather than on Pango &
+# LaTeX.
+# Scene files are scanned without running them: every Text(...), MathTex(...)
+# & Tex(...) call whose arguments are all literals (strings, numbers, ...) or
+# Manim constants (e.g. color=BLUE) is collected. With --batch-tex, the LaTeX
+# of every Tex & MathTex call that isn't cached yet is first compiled as one
+# batch (see media_cache.compile_tex_batch). Each distinct call is then made
+# once in a process pool, which renders any SVG that is still missing.
+# Calls built from variables (e.g. Text(f"Epoch: {epoch}")) are skipped.
+#
+# Usage (scans every course folder by default):
+#   python prewarm_text_cache.py [--batch-tex] [file or folder ...]
+
+# Relevant imports
+import ast
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import manim
+from media_cache import (BATCH_TEX_OPTION, collect_tex, compile_tex_batch
+                         , use_shared_media_cache)
+
+# Mobjects whose calls are collected
+TEXT_CLASSES = ["Text", "MathTex", "Tex"]
+
+# Mobjects compiled with LaTeX
+TEX_CLASSES = ["MathTex", "Tex"]
+
+# Files that aren't scenes
+SKIPPED_FILES = ["media_cache.py", "prewarm_text_cache.py"]
+
+
+# A call argument as ("literal", value) or ("constant", name of a Manim
+# constant), or None if it can't be known without running the scene
+def static_argument(node):
+    if isinstance(node, ast.Name):
+        return ("constant", node.id) if hasattr(manim, node.id) else None
+    try:
+        return ("literal", ast.literal_eval(node))
+    except ValueError:
+        return None
+
+
+# (class name, arguments, keyword arguments) of every Text / MathTex / Tex
+# call in a Python file with only static arguments
+def extract_text_calls(path):
+    try:
+        tree = ast.parse(Path(path).read_text(encoding="utf-8"), filename=str(path))
+    except (SyntaxError, UnicodeDecodeError) as error:
+        print(f'Skipping {path}: {error}')
+        return []
+
+    calls = []
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in TEXT_CLASSES and node.args):
+            continue
+        args = [static_argument(arg) for arg in node.args]
+        kwargs = [(keyword.arg, static_argument(keyword.value)) for keyword in node.keywords]
+        # Skip *args, **kwargs & anything computed at run time
+        if None in args or any(name is None or value is None for name, value in kwargs):
+            continue
+        calls += [(node.func.id, tuple(args), tuple(kwargs))]
+    return calls
+
+
+# Python files under the given files & folders
+def scene_files(paths):
+    for path in map(Path, paths):
+        files = sorted(path.rglob("*.py")) if path.is_dir() else [path]
+        for file in files:
+            if file.name not in SKIPPED_FILES and "media" not in file.parts:
+                yield file
+
+
+def resolve(argument):
+    kind, value = argument
+    return getattr(manim, value) if kind == "constant" else value
+
+
+def make_call(call):
+    class_name, args, kwargs = call
+    return getattr(manim, class_name)(*[resolve(arg) for arg in args]
+                                      , **{name: resolve(value) for name, value in kwargs})
+
+
+# Make one call in a worker process (rendering its SVG if it isn't cached).
+# Returns an error message, or None.
+def render_call(call):
+    try:
+        make_call(call)
+    except Exception as error:
+        return f'{call[0]}{tuple(resolve(arg) for arg in call[1])}: {error}'
+    return None
+
+
+# Compile the LaTeX of the Tex / MathTex calls in some scene files (or of the
+# given calls) as one batch. Returns the number of expressions compiled.
+def prewarm_tex(paths, calls=None):
+    if calls is None:
+        calls = [call for file in scene_files(paths) for call in extract_text_calls(file)]
+    expressions = []
+    for call in calls:
+        if call[0] in TEX_CLASSES:
+            try:
+                expression = collect_tex(lambda: make_call(call))
+            except Exception:
+                # Leave calls that fail for the pool to report
+                continue
+            if expression is not None:
+                expressions += [expression]
+    return compile_tex_batch(expressions)
+
+
+def prewarm(paths, workers=None, batch_tex=False):
+    # Collect each distinct call once
+    calls = {}
+    for file in scene_files(paths):
+        for call in extract_text_calls(file):
+            calls.setdefault(repr(call), call)
+    print(f'{len(calls)} distinct Text/MathTex/Tex calls found')
+
+    start = time.perf_counter()
+    use_shared_media_cache()
+    if batch_tex:
+        compiled = prewarm_tex(paths, list(calls.values()))
+        print(f'Compiled {compiled} LaTeX expressions in one batch')
+    with ProcessPoolExecutor(max_workers=workers
+                             , initializer=use_shared_media_cache) as pool:
+        errors = [error for error in pool.map(render_call, calls.values(), chunksize=4)
+                  if error is not None]
+    for error in errors:
+        print(f'Failed: {error}')
+    print(f'Prewarmed {len(calls) - len(errors)} calls in {time.perf_counter() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    root = Path(__file__).resolve().parent
+    paths = [argument for argument in sys.argv[1:] if argument != BATCH_TEX_OPTION]
+    prewarm(paths or [root], workers=os.cpu_count()
+            , batch_tex=BATCH_TEX_OPTION in sys.argv)
@@ -0,0 +1,28 @@
+# Relevant imports
+from functools import lru_cache
+
+from manim import *
+
+# Number of Text mobjects kept in memory
+TEXT_CACHE_SIZE = 512
+
+
+# Manim keeps the mobjects parsed from SVG files in memory, but every Text
+# created still rewrites its cached SVG file (to strip Pango's trailing move
+# command, unless rendered through media_cache.py) & closes each glyph's
+# outline in a Python loop over all of its points. This builds each (string,
+# font, size, colour) once & keeps the result in a bounded LRU cache, handing
+# out a copy each time, so repeated labels skip the file writing & the
+# per-point loop.
+# The copies are independent mobjects, so they can be moved & recoloured
+# freely.
+#   header = cached_text("Prediction", font_size=15)
+def cached_text(text, font_size=DEFAULT_FONT_SIZE, color=WHITE, font=""):
+    # ManimColor isn't hashable in Manim 0.18, so the cache is keyed on the
+    # colour's hex code instead
+    return _parsed_text(text, font_size, ManimColor(color).to_hex(), font).copy()
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _parsed_text(text, font_size, color, font):
+    return Text(text, font_size=font_size, color=ManimColor(color), font=font)
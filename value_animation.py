@@ -0,0 +1,40 @@
+# Relevant imports
+from manim import *
+
+
+# Base class for animations that change a mobject's values in place (e.g. a
+# heatmap's colour array or a label's number) rather than transforming a copy
+# of the mobject. Subclasses pass the target values to __init__ & define:
+#   get_values(): a copy of the values the mobject shows now
+#   set_values(values): show values on the mobject
+# Each frame shows the values part way from the start to the target (see
+# interpolate_values), finishing on exactly the target values.
+class ValueAnimation(Animation):
+
+    def __init__(self, mobject, target_values, **kwargs):
+        self.target_values = target_values
+        super().__init__(mobject, **kwargs)
+
+    # Only the values change, so there's no need to copy the mobject
+    def create_starting_mobject(self):
+        return Mobject()
+
+    def begin(self):
+        self.start_values = self.get_values()
+        super().begin()
+
+    def get_values(self):
+        raise NotImplementedError
+
+    def set_values(self, values):
+        raise NotImplementedError
+
+    # The values `progress` (0 to 1) of the way from the start to the target
+    def interpolate_values(self, progress):
+        return self.start_values + progress * (self.target_values - self.start_values)
+
+    def interpolate_mobject(self, alpha):
+        if alpha >= 1:
+            self.set_values(self.target_values)
+        else:
+            self.set_values(self.interpolate_values(self.rate_func(alpha)))